@@ -0,0 +1,236 @@
+import pandas as pd
+import numpy as np
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import tempfile
+import platform
+from contextlib import redirect_stdout
+
+import start
+
+FIRST_NAMES = ['John', 'Mary', 'Ann', 'Robert', 'Li', 'Samuel', 'Eve', 'Thomas', 'Priya', 'Carlos']
+LAST_NAMES = ['Smith', 'Jones', 'Brown', 'Lee', 'Garcia', 'Miller', 'Davis', 'Wilson', 'Moore', 'Clark',
+              'Taylor', 'Anderson', 'Thomas', 'Martin', 'Walker', 'Young', 'Hall', 'King', 'Wright', 'Lopez']
+VENDORS = ['AIRLINE', 'HOTEL', 'TAXI', 'RESTAURANT', 'OFFICE SUPPLY', 'CONFERENCE', 'PARKING', 'RENTAL CAR']
+CATEGORIES = ['Airfare', 'Lodging', 'Ground Transportation', 'Meals', 'Supplies', 'Registration']
+
+# Benchmark scales: cardholders x transactions per cardholder
+SCALES = {
+    'small': {'cardholders': 10, 'per_person': 25},
+    'medium': {'cardholders': 50, 'per_person': 40},
+    'large': {'cardholders': 200, 'per_person': 60},
+}
+
+BENCHMARKS = ('find_sum_combinations', 'find_matching_groups', 'remove_zero_sum_groups', 'pipeline')
+
+def random_amounts(rng, size, distribution='lognormal'):
+    """Transaction amounts in dollars, at least $1.00"""
+    if distribution == 'uniform':
+        cents = rng.integers(100, 50000, size)
+    elif distribution == 'lognormal':
+        # Mostly small card charges with a long tail of airfare/hotel sized ones
+        cents = np.clip(np.round(rng.lognormal(mean=8.5, sigma=1.0, size=size)), 100, 500000)
+    else:
+        raise ValueError(f"Unknown amount distribution: {distribution}")
+    return cents.astype(np.int64) / 100
+
+def split_amount(rng, amount, parts):
+    """Split amount into parts positive amounts that add up to it exactly in cents"""
+    total = int(round(amount * 100))
+    if total < parts:
+        return [amount]
+    cuts = np.sort(rng.choice(np.arange(1, total), parts - 1, replace=False))
+    return (np.diff(np.concatenate(([0], cuts, [total]))) / 100).tolist()
+
+def generate_statements(cardholders=10, per_person=25, split_ratio=0.15, refund_ratio=0.1,
+                        amount_distribution='lognormal', seed=0):
+    """Synthetic bank statement and Certify report frames with the columns reconcile_statements reads.
+
+    For every cardholder, per_person charges are generated. A split_ratio share of them is
+    booked as one line on one side and 2-3 lines on the other; a refund_ratio share is a
+    bank charge with a same-day refund (a zero-sum pair). The rest match one to one, with
+    a few unmatched Certify lines and a few posting-date offsets.
+    """
+    rng = np.random.default_rng(seed)
+    start_date = pd.Timestamp('2024-01-01')
+    bank_rows = []
+    certify_rows = []
+
+    for person in range(cardholders):
+        first = FIRST_NAMES[person % len(FIRST_NAMES)]
+        last = LAST_NAMES[person % len(LAST_NAMES)]
+        if person >= len(LAST_NAMES):
+            last = f"{last}{person // len(LAST_NAMES)}"
+        bank_name = f"{first.upper()} {last.upper()}"
+        certify_name = f"{first} {last}"
+
+        amounts = random_amounts(rng, per_person, amount_distribution)
+        kinds = rng.random(per_person)
+        for amount, kind in zip(amounts.tolist(), kinds.tolist()):
+            date = start_date + pd.Timedelta(days=int(rng.integers(0, 60)))
+            vendor = VENDORS[rng.integers(len(VENDORS))]
+            category = CATEGORIES[rng.integers(len(CATEGORIES))]
+
+            if kind < split_ratio:
+                parts = split_amount(rng, amount, int(rng.integers(2, 4)))
+                if rng.random() < 0.5:
+                    bank_rows.extend((bank_name, part, date, vendor) for part in parts)
+                    certify_rows.append((certify_name, amount, date, vendor, category))
+                else:
+                    bank_rows.append((bank_name, amount, date, vendor))
+                    certify_rows.extend((certify_name, part, date, vendor, category) for part in parts)
+            elif kind < split_ratio + refund_ratio:
+                bank_rows.append((bank_name, amount, date, vendor))
+                bank_rows.append((bank_name, -amount, date, f"{vendor} REFUND"))
+            else:
+                bank_rows.append((bank_name, amount, date, vendor))
+                if rng.random() < 0.95:
+                    certify_date = date + pd.Timedelta(days=int(rng.integers(0, 4)))
+                    certify_rows.append((certify_name, amount, certify_date, vendor, category))
+
+    bank_df = pd.DataFrame(bank_rows, columns=['ACC.ACCOUNT NAME', 'FIN.TRANSACTION AMOUNT', 'FIN.POSTING DATE',
+                                               'FIN.TRANSACTION DESCRIPTION'])
+    certify_df = pd.DataFrame(certify_rows, columns=['Employee', 'USD Amt', 'Processed Date', 'Vendor',
+                                                     'Expense Category'])
+    # Exports are not grouped by cardholder
+    bank_df = bank_df.sample(frac=1, random_state=seed).reset_index(drop=True)
+    certify_df = certify_df.sample(frac=1, random_state=seed).reset_index(drop=True)
+    return bank_df, certify_df
+
+def time_call(func, repeat=3):
+    """Best wall time of repeat calls, with the library's progress output suppressed.
+
+    The combination memo is cleared before every call, so repeats time the searches
+    rather than cache lookups.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start.COMBINATION_MEMO.clear()
+        with redirect_stdout(io.StringIO()):
+            start_time = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start_time)
+    return best
+
+def sum_combination_cases(certify_df, count=20, seed=0):
+    """(transactions, target) pairs for find_sum_combinations: a 3-line target from the busiest cardholders"""
+    rng = np.random.default_rng(seed)
+    cases = []
+    for _, group in certify_df.groupby('Employee', sort=True):
+        if len(group) < 3:
+            continue
+        transactions = [{'index': index, 'amount': amount} for index, amount in group['USD Amt'].items()]
+        picks = rng.choice(len(transactions), 3, replace=False)
+        cases.append((transactions, sum(transactions[i]['amount'] for i in picks)))
+        if len(cases) == count:
+            break
+    return cases
+
+def run_benchmarks(scale, repeat=3, seed=0, benchmarks=BENCHMARKS, **generator_options):
+    """Time each benchmark at one scale; returns {benchmark: seconds}"""
+    options = dict(SCALES[scale], seed=seed, **generator_options)
+    bank_df, certify_df = generate_statements(**options)
+    results = {}
+
+    if 'find_sum_combinations' in benchmarks:
+        cases = sum_combination_cases(certify_df, seed=seed)
+        results['find_sum_combinations'] = time_call(
+            lambda: [start.find_sum_combinations(transactions, target) for transactions, target in cases], repeat
+        )
+
+    if 'find_matching_groups' in benchmarks:
+        results['find_matching_groups'] = time_call(
+            lambda: start.find_matching_groups(bank_df.copy(), certify_df.copy()), repeat
+        )
+
+    if 'remove_zero_sum_groups' in benchmarks:
+        results['remove_zero_sum_groups'] = time_call(
+            lambda: start.remove_zero_sum_groups(bank_df, 'ACC.ACCOUNT NAME', 'FIN.TRANSACTION AMOUNT',
+                                                 'FIN.TRANSACTION DESCRIPTION', 'FIN.POSTING DATE'), repeat
+        )
+
+    if 'pipeline' in benchmarks:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bank_file = os.path.join(tmp_dir, "bank_statement.xlsx")
+            certify_file = os.path.join(tmp_dir, "certify_report.xlsx")
+            bank_df.to_excel(bank_file, index=False)
+            certify_df.to_excel(certify_file, index=False)
+            results['pipeline'] = time_call(
+                lambda: start.reconcile_statements(bank_file, certify_file, use_cache=False), repeat
+            )
+
+    print(f"{scale}: {len(bank_df)} bank / {len(certify_df)} certify rows")
+    for name, seconds in results.items():
+        print(f"  {name:<24} {seconds:>9.4f}s")
+    return results
+
+def compare_results(results, baseline, tolerance):
+    """Benchmarks slower than baseline * (1 + tolerance), as (scale, name, baseline, current) tuples"""
+    regressions = []
+    for scale, timings in results.items():
+        for name, seconds in timings.items():
+            reference = baseline.get('results', {}).get(scale, {}).get(name)
+            if reference is None:
+                continue
+            ratio = seconds / reference if reference else float('inf')
+            print(f"{scale}/{name}: {reference:.4f}s -> {seconds:.4f}s ({ratio:.2f}x)")
+            if seconds > reference * (1 + tolerance):
+                regressions.append((scale, name, reference, seconds))
+    return regressions
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Benchmark the reconciliation matcher on synthetic statements.")
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=['small', 'medium'],
+                        help="Scales to run (default: small medium)")
+    parser.add_argument('--benchmarks', nargs='+', choices=BENCHMARKS, default=list(BENCHMARKS),
+                        help="Benchmarks to run (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per benchmark; the best time is kept")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--split-ratio', type=float, default=0.15,
+                        help="Share of charges split across several lines on one side")
+    parser.add_argument('--refund-ratio', type=float, default=0.1,
+                        help="Share of charges refunded on the same day (zero-sum pairs)")
+    parser.add_argument('--amounts', choices=['lognormal', 'uniform'], default='lognormal',
+                        help="Amount distribution")
+    parser.add_argument('--save-baseline', metavar='PATH', help="Write the results to a baseline JSON file")
+    parser.add_argument('--compare', metavar='PATH', help="Compare against a baseline JSON file")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed slowdown against the baseline before failing (default: 0.25 = 25%%)")
+    return parser
+
+if __name__ == "__main__":
+    args = build_arg_parser().parse_args()
+
+    results = {}
+    for scale in args.scales:
+        results[scale] = run_benchmarks(
+            scale, repeat=args.repeat, seed=args.seed, benchmarks=args.benchmarks,
+            split_ratio=args.split_ratio, refund_ratio=args.refund_ratio, amount_distribution=args.amounts
+        )
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'pandas': pd.__version__,
+                'numpy': np.__version__,
+                'machine': platform.machine(),
+                'options': vars(args),
+                'results': results
+            }, f, indent=2)
+        print(f"Saved baseline to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.tolerance)
+        if regressions:
+            print("\nPerformance regressions:")
+            for scale, name, reference, seconds in regressions:
+                print(f"  {scale}/{name}: {reference:.4f}s -> {seconds:.4f}s")
+            sys.exit(1)
+        print("\nNo regressions against the baseline.")
@@ -0,0 +1,63 @@
+"""Bank statement to Certify report reconciliation.
+
+Submodules load on first use of one of their names (reconciliation.find_matching_groups imports
+pandas and the matching code; reconciliation.ModernReconciliationGUI imports Tk), so importing
+the package itself is cheap.
+"""
+import importlib
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    # constants
+    'PROGRAM_DIR': 'constants', 'CACHE_DIR': 'constants', 'BANK_FILE': 'constants', 'CERTIFY_FILE': 'constants',
+    'MATCH_ENGINES': 'constants', 'OPTIMAL_TIME_BUDGET': 'constants', 'OUTPUT_FORMATS': 'constants',
+    'PARQUET_ENGINES': 'constants', 'STREAM_PARTITIONS': 'constants', 'available_output_formats': 'constants',
+    # monitor
+    'ReconciliationCancelled': 'monitor', 'PipelineProfile': 'monitor', 'PipelineMonitor': 'monitor',
+    # core
+    'get_last_name': 'core', 'NAME_SUFFIXES': 'core', 'SOUNDEX_CODES': 'core', 'split_name': 'core',
+    'cardholder_key': 'core', 'soundex': 'core', 'NameResolver': 'core', 'map_unique': 'core', 'to_cents': 'core',
+    'to_cents_array': 'core', 'MISSING_DATE': 'core', 'to_date_ordinals': 'core', 'TransactionArrays': 'core',
+    'CombinationMemo': 'core', 'COMBINATION_MEMO': 'core', 'subset_sum_positions': 'core',
+    'find_sum_combinations': 'core', 'MAX_TABLE_ENTRIES': 'core', 'CombinationSumIndex': 'core',
+    'find_exact_matches': 'core', 'DateWindowIndex': 'core', 'match_sum_combinations': 'core',
+    'ROW_WEIGHT': 'core', 'MISSING_DATE_COST': 'core', 'MAX_SPLIT_CANDIDATES': 'core', 'MAX_PACKING_ROWS': 'core',
+    'optimal_match_cardholder': 'core', 'find_matching_groups': 'core', 'find_zero_sum_combinations': 'core',
+    'remove_zero_sum_groups': 'core', 'RBT_PATTERN': 'core', 'BANK_CATEGORICAL_COLUMNS': 'core',
+    'CERTIFY_CATEGORICAL_COLUMNS': 'core', 'prefilter_bank': 'core', 'prefilter_certify': 'core',
+    'DERIVED_COLUMNS': 'core',
+    # files
+    'BANK_COLUMNS': 'files', 'CERTIFY_COLUMNS': 'files', 'COLUMN_TYPES': 'files', 'apply_column_types': 'files',
+    'excel_engine': 'files', 'load_excel': 'files',
+    'load_bank_statement': 'files', 'load_certify_report': 'files', 'UNDATED_PARTITION': 'files',
+    'partition_keys': 'files', 'spill_partitions': 'files', 'read_spilled_partition': 'files',
+    'CACHE_MAX_BYTES': 'files', 'CACHE_VERSION': 'files', 'InputCache': 'files', 'load_input': 'files',
+    'write_excel': 'files', 'write_parquet': 'files', 'write_csv': 'files', 'OUTPUT_WRITERS': 'files',
+    'StreamingTableWriter': 'files', 'save_results': 'files',
+    # pipeline
+    'reconcile_statements': 'pipeline', 'build_match_table': 'pipeline', 'reconcile_frames': 'pipeline',
+    'STATE_VERSION': 'pipeline', 'row_fingerprints': 'pipeline', 'new_state': 'pipeline', 'load_state': 'pipeline',
+    'save_state': 'pipeline', 'load_previous_unmatched': 'pipeline', 'reconcile_incremental': 'pipeline',
+    'reconcile_streaming': 'pipeline', 'compare_engines': 'pipeline', 'BATCH_SUMMARY_COLUMNS': 'pipeline',
+    'read_batch_manifest': 'pipeline', 'discover_batch_pairs': 'pipeline', 'reconcile_pair': 'pipeline',
+    'run_batch': 'pipeline',
+    # store
+    'SCHEMA_VERSION': 'store', 'ReconciliationStore': 'store',
+    # gui
+    'STAGE_LABELS': 'gui', 'ModernReconciliationGUI': 'gui',
+    # cli
+    'build_arg_parser': 'cli', 'main': 'cli',
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
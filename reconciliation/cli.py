@@ -0,0 +1,229 @@
+"""Command line entry point. pandas and the matching code load only after the arguments are
+parsed, and Tk only when the GUI starts, so --help and argument errors return immediately."""
+import os
+import sys
+import time
+import argparse
+import importlib
+
+from .constants import (BANK_FILE, CERTIFY_FILE, MATCH_ENGINES, OPTIMAL_TIME_BUDGET, OUTPUT_FORMATS,
+                        PARQUET_ENGINES, PROGRAM_DIR, STREAM_PARTITIONS, available_output_formats)
+
+# Imported in this order by the command line, each timed separately for --timing
+CLI_MODULES = ('numpy', 'pandas', f'{__package__}.core', f'{__package__}.files', f'{__package__}.pipeline')
+
+def process_age():
+    """Seconds since this process started, from /proc; None where that is unavailable"""
+    try:
+        with open('/proc/self/stat') as f:
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+class StartupTimer:
+    """Wall time of each start-up step, measured from program entry, for --timing"""
+
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self.interpreter = process_age()
+        if self.interpreter is not None:
+            self.interpreter -= time.perf_counter() - self.started
+        self.steps = []
+        self.ready = None
+        self._last = self.started
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.steps.append((name, now - self._last))
+        self._last = now
+
+    def import_modules(self, names):
+        for name in names:
+            importlib.import_module(name)
+            self.mark(f"import {name}")
+        self.ready = time.perf_counter()
+
+    def print_summary(self):
+        print("\nTiming:")
+        if self.interpreter is not None:
+            print(f"  {'interpreter start':<32} {max(self.interpreter, 0.0):>8.3f}s")
+        for name, seconds in self.steps:
+            print(f"  {name:<32} {seconds:>8.3f}s")
+        cold_start = (self.ready or self._last) - self.started + max(self.interpreter or 0.0, 0.0)
+        print(f"  {'cold start (to first work)':<32} {cold_start:>8.3f}s")
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        description="Reconcile bank_statement.xlsx against certify_report.xlsx in the program directory."
+    )
+    parser.add_argument('legacy_args', nargs='*', help=argparse.SUPPRESS)
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Parse the Excel inputs again instead of using the parsed-input cache")
+    parser.add_argument('--clear-cache', action='store_true',
+                        help="Delete every cached input before running")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='xlsx',
+                        help="Output file format (default: xlsx)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes used to match cardholders, or with --batch whole pairs, in parallel "
+                             "(0 = one per CPU)")
+    parser.add_argument('--output-dir', default="reconciliation_output",
+                        help="Directory for the output files (default: reconciliation_output)")
+    parser.add_argument('--batch', metavar='MANIFEST_OR_GLOB',
+                        help="Reconcile many pairs: a CSV manifest with name,bank,certify columns, a directory, "
+                             "or a glob of bank files paired with the certify file named like each")
+    parser.add_argument('--stream', choices=STREAM_PARTITIONS,
+                        help="Reconcile one posting month or cardholder bucket at a time to bound memory "
+                             "(xlsx and csv output only)")
+    parser.add_argument('--carry-months', type=int, default=1,
+                        help="With --stream month, months an unmatched row stays open for later matches (default: 1)")
+    parser.add_argument('--state', metavar='PATH',
+                        help="Incremental mode: skip rows settled by earlier runs and carry their unmatched "
+                             "rows forward, updating the state file afterwards")
+    parser.add_argument('--previous-output', metavar='DIR',
+                        help="Incremental mode: carry a previous run's unmatched outputs into this run "
+                             "(or, given a --store file, the unmatched rows of its latest run)")
+    parser.add_argument('--date-window', type=int, metavar='DAYS',
+                        help="Only combine transactions dated within DAYS of the transaction they add up to")
+    parser.add_argument('--resolve-names', action='store_true',
+                        help="Group cardholders by resolved name (suffixes, hyphenated and 'LAST, FIRST' names, "
+                             "first initial) instead of bare last name")
+    parser.add_argument('--engine', choices=MATCH_ENGINES, default='greedy',
+                        help="greedy: first match found (fast); optimal: per-cardholder search for the "
+                             "matching that leaves the fewest rows unmatched (default: greedy)")
+    parser.add_argument('--time-budget', type=float, default=OPTIMAL_TIME_BUDGET,
+                        help=f"Seconds the optimal engine may search per cardholder "
+                             f"(default: {OPTIMAL_TIME_BUDGET:g})")
+    parser.add_argument('--compare-engines', action='store_true',
+                        help="Run both engines and report their match rates and run times; writes no outputs")
+    parser.add_argument('--profile', action='store_true',
+                        help="Write per-stage and per-cardholder timings to profile.json and "
+                             "profile_cardholders.csv in the output directory")
+    parser.add_argument('--store', metavar='PATH',
+                        help="Also record the run in this SQLite store (query it with "
+                             "python -m reconciliation.store PATH)")
+    parser.add_argument('--pipeline-columns', action='store_true',
+                        help="Load only the columns reconciliation needs (faster on wide sheets); the "
+                             "unmatched outputs then carry just those columns instead of the whole sheet")
+    parser.add_argument('--timing', action='store_true',
+                        help="Report cold-start time (interpreter start, argument parsing, each library import) "
+                             "and the run and write times (python -X importtime lists every module)")
+    return parser
+
+def run_gui():
+    import tkinter as tk
+    from .gui import ModernReconciliationGUI
+    try:
+        root = tk.Tk()
+        app = ModernReconciliationGUI(root)
+        root.mainloop()
+    except Exception as e:
+        print(f"Error starting GUI: {str(e)}")
+        return 1
+    print("\nProgram execution completed.")
+    return 0
+
+def main(argv=None, started=None):
+    """Run the command line with argv (default sys.argv[1:]), or the GUI when there are no arguments.
+
+    started is the perf_counter() value at program entry, used by --timing. Returns the exit status.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        return run_gui()
+    
+    # Command line mode
+    timer = StartupTimer(started)
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if args.format not in available_output_formats():
+        parser.error(f"--format {args.format} needs one of {', '.join(PARQUET_ENGINES)} installed")
+    if args.stream and args.format == 'parquet':
+        parser.error("--stream writes xlsx or csv output")
+    if args.stream and (args.state or args.previous_output):
+        parser.error("--stream cannot be combined with incremental mode")
+    if args.batch and (args.stream or args.state or args.previous_output):
+        parser.error("--batch cannot be combined with --stream or incremental mode")
+    if args.compare_engines and (args.batch or args.stream or args.state or args.previous_output):
+        parser.error("--compare-engines runs a single whole-file reconciliation")
+    if args.store and (args.stream or args.compare_engines):
+        parser.error("--store records whole-file, incremental and batch runs")
+    if args.profile and (args.batch or args.compare_engines):
+        parser.error("--profile records whole-file, incremental and streaming runs")
+    timer.mark('entry and argument parsing')
+    preserve_original = not args.pipeline_columns
+    bank_file = os.path.join(PROGRAM_DIR, BANK_FILE)
+    certify_file = os.path.join(PROGRAM_DIR, CERTIFY_FILE)
+    
+    status = 0
+    try:
+        timer.import_modules(CLI_MODULES)
+        from .core import NameResolver
+        from .files import InputCache, save_results
+        from .monitor import PipelineMonitor
+        from .pipeline import (compare_engines, discover_batch_pairs, read_batch_manifest, reconcile_incremental,
+                               reconcile_statements, reconcile_streaming, run_batch)
+        
+        if args.clear_cache:
+            InputCache().clear()
+            print("Input cache cleared.")
+        monitor = PipelineMonitor()
+        name_resolver = NameResolver() if args.resolve_names else None
+        if args.batch:
+            jobs = (read_batch_manifest(args.batch) if args.batch.lower().endswith('.csv')
+                    else discover_batch_pairs(args.batch))
+            summary = run_batch(jobs, args.output_dir, args.workers or None, use_cache=not args.no_cache,
+                                output_format=args.format, date_window_days=args.date_window,
+                                resolve_names=args.resolve_names, engine=args.engine,
+                                time_budget=args.time_budget, store=args.store,
+                                preserve_original=preserve_original)
+            # Failed pairs are listed in the summary; the batch as a whole then fails
+            status = int((summary['status'] != 'ok').any())
+        elif args.compare_engines:
+            compare_engines(bank_file, certify_file, use_cache=not args.no_cache, workers=args.workers or None,
+                            date_window_days=args.date_window, name_resolver=name_resolver,
+                            time_budget=args.time_budget, preserve_original=preserve_original)
+        elif args.stream:
+            reconcile_streaming(bank_file, certify_file, args.output_dir, partition=args.stream,
+                                carry_months=args.carry_months, preserve_original=preserve_original,
+                                output_format=args.format, workers=args.workers or None, monitor=monitor,
+                                date_window_days=args.date_window, name_resolver=name_resolver,
+                                engine=args.engine, time_budget=args.time_budget)
+        else:
+            if args.state or args.previous_output:
+                matches, unmatched_bank, unmatched_certify = reconcile_incremental(
+                    bank_file, certify_file, args.state, args.previous_output,
+                    preserve_original=preserve_original, use_cache=not args.no_cache, workers=args.workers or None,
+                    monitor=monitor, date_window_days=args.date_window, name_resolver=name_resolver,
+                    engine=args.engine, time_budget=args.time_budget
+                )
+            else:
+                matches, unmatched_bank, unmatched_certify = reconcile_statements(
+                    bank_file, certify_file, preserve_original=preserve_original, use_cache=not args.no_cache,
+                    workers=args.workers or None, monitor=monitor, date_window_days=args.date_window,
+                    name_resolver=name_resolver, engine=args.engine, time_budget=args.time_budget
+                )
+            timer.mark('reconcile')
+            with monitor.profile.stage('write',
+                                       rows_in=len(matches) + len(unmatched_bank) + len(unmatched_certify)):
+                save_results(matches, unmatched_bank, unmatched_certify, args.output_dir, args.format, args.store)
+            timer.mark('write')
+        if args.profile:
+            monitor.profile.print_summary()
+            for path in monitor.profile.save(args.output_dir):
+                print(f"Saved profile to {path}")
+    except FileNotFoundError as e:
+        print(f"\nError: File not found - {str(e)}")
+        print("Please make sure both bank_statement.xlsx and certify_report.xlsx exist in the program directory.")
+        status = 1
+    except Exception as e:
+        print(f"\nUnexpected error occurred: {str(e)}")
+        print("If this error persists, please check the file formats and contents.")
+        status = 1
+    finally:
+        if args.timing:
+            timer.print_summary()
+        print("\nProgram execution completed.")
+    return status
@@ -0,0 +1,24 @@
+"""Settings shared by the command line, the GUI and the pipeline.
+
+Kept free of pandas and numpy so that argument parsing and --help stay fast.
+"""
+import importlib.util
+import os
+
+# Program directory: default input files, and the parsed-input cache next to them
+PROGRAM_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(PROGRAM_DIR, '.reconciliation_cache')
+BANK_FILE = 'bank_statement.xlsx'
+CERTIFY_FILE = 'certify_report.xlsx'
+
+MATCH_ENGINES = ('greedy', 'optimal')
+# Seconds the optimal engine may search per cardholder
+OPTIMAL_TIME_BUDGET = 2.0
+OUTPUT_FORMATS = ('xlsx', 'parquet', 'csv')
+PARQUET_ENGINES = ('pyarrow', 'fastparquet')
+STREAM_PARTITIONS = ('month', 'cardholder')
+
+def available_output_formats():
+    """OUTPUT_FORMATS that can be written here; parquet needs one of PARQUET_ENGINES installed"""
+    has_parquet = any(importlib.util.find_spec(engine) is not None for engine in PARQUET_ENGINES)
+    return tuple(fmt for fmt in OUTPUT_FORMATS if fmt != 'parquet' or has_parquet)
@@ -0,0 +1,1272 @@
+"""Matching engines: name resolution, cents arithmetic, subset-sum search and zero-sum removal"""
+import pandas as pd
+import numpy as np
+import os
+import json
+import threading
+import importlib.util
+import math
+import re
+import stat
+import time
+import tempfile
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
+
+from .constants import CACHE_DIR, MATCH_ENGINES, OPTIMAL_TIME_BUDGET
+from .monitor import PipelineMonitor
+
+def get_last_name(name):
+    """Extract last name from various name formats with debug printing"""
+    if not isinstance(name, str):
+        return ''
+    
+    if ',' in name:
+        last_name = name.split(',')[0].strip().upper()
+        return last_name
+    last_name = name.split()[-1].strip().upper()
+    return last_name
+
+# Name resolution: raw names from both files map to a canonical cardholder key, LAST + first initial
+NAME_SUFFIXES = {'JR', 'SR', 'II', 'III', 'IV', 'V', 'MD', 'PHD', 'ESQ', 'CPA', 'DDS'}
+SOUNDEX_CODES = {letter: str(code) for code, letters in enumerate(
+    ['AEIOUYHW', 'BFPV', 'CGJKQSXZ', 'DT', 'L', 'MN', 'R']) for letter in letters}
+
+def split_name(name):
+    """(first initial, surname parts) of a 'FIRST [MIDDLE] LAST' or 'LAST, FIRST' name.
+
+    Suffixes such as JR or III are dropped and hyphenated surnames are split into parts.
+    """
+    if not isinstance(name, str):
+        return '', []
+    text = re.sub(r"[^A-Z,\- ]", ' ', name.upper())
+    if ',' in text:
+        last, _, first = text.partition(',')
+        first_tokens = [t for t in first.split() if t not in NAME_SUFFIXES]
+        last_tokens = [t for t in last.split() if t not in NAME_SUFFIXES]
+    else:
+        tokens = [t for t in text.split() if t not in NAME_SUFFIXES]
+        first_tokens, last_tokens = tokens[:-1], tokens[-1:]
+    parts = [part for token in last_tokens for part in token.split('-') if part]
+    initial = first_tokens[0][0] if first_tokens else ''
+    return initial, parts
+
+def cardholder_key(initial, parts):
+    return f"{''.join(parts)} {initial}".strip()
+
+def soundex(text):
+    """American Soundex code of a word, e.g. ROBERT -> R163"""
+    text = ''.join(ch for ch in text.upper() if ch in SOUNDEX_CODES)
+    if not text:
+        return ''
+    digits = []
+    previous = SOUNDEX_CODES[text[0]]
+    for ch in text[1:]:
+        code = SOUNDEX_CODES[ch]
+        if code != '0' and code != previous:
+            digits.append(code)
+        if ch not in 'HW':
+            previous = code
+    return (text[0] + ''.join(digits) + '000')[:4]
+
+@contextmanager
+def file_lock(path, timeout=60.0, stale_after=120.0):
+    """Hold an exclusive lock on path while the block runs, across processes.
+
+    The lock is a path + '.lock' file created with O_EXCL, which works on every
+    platform; a lock file older than stale_after seconds is taken to be left by a
+    crashed writer and removed.
+    """
+    lock_path = path + '.lock'
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > stale_after:
+                    os.remove(lock_path)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"Timed out waiting for the lock on {path}")
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        os.remove(lock_path)
+
+def replace_file(tmp_path, path):
+    """Move tmp_path over path, keeping the mode path already has (the umask default for a new file).
+
+    tempfile.mkstemp creates files only their owner can read, which would lock other
+    users out of the shared cache and name mapping.
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    os.chmod(tmp_path, mode)
+    os.replace(tmp_path, path)
+
+class NameResolver:
+    """Maps raw cardholder names from both files to canonical cardholder keys.
+
+    Bank names define the keys (surname plus first initial, so people sharing a surname
+    stay apart). Each Certify name is resolved against them through blocking indexes,
+    trying in turn: the exact key, a shared surname part with the same initial (for
+    hyphenated names), the Soundex code of the surname with the same initial, and finally
+    a surname that belongs to a single cardholder. Names that stay ambiguous keep their
+    own key. Resolutions are cached in a JSON file between runs, which may be edited by hand.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, 'name_map.json')
+        self.mapping = {'bank': {}, 'certify': {}}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.mapping.update(json.load(f))
+    
+    def bank_key(self, name):
+        """Canonical key of a bank name"""
+        key = self.mapping['bank'].get(name)
+        if key is None:
+            key = self.mapping['bank'][name] = cardholder_key(*split_name(name))
+        return key
+    
+    def _resolve_certify(self, name, bank_keys, by_part, by_soundex, by_surname):
+        initial, parts = split_name(name)
+        own_key = cardholder_key(initial, parts)
+        if own_key in bank_keys:
+            return own_key
+        candidate_sets = (
+            {key for part in parts for key in by_part.get((part, initial), ())},
+            set(by_soundex.get((soundex(''.join(parts)), initial), ())),
+            set(by_surname.get(''.join(parts), ()))
+        )
+        for candidates in candidate_sets:
+            if len(candidates) == 1:
+                return candidates.pop()
+            if candidates:
+                break
+        return own_key
+    
+    def certify_resolver(self, bank_names):
+        """Function giving the canonical key of a certify name, resolved against the cardholders of bank_names.
+
+        The blocking indexes are built once, so certify names can be resolved as they are met.
+        """
+        bank_keys = {name: self.bank_key(name) for name in bank_names}
+        known = set(bank_keys.values())
+        
+        # Blocking indexes over the bank keys
+        by_part = {}
+        by_soundex = {}
+        by_surname = {}
+        for key in known:
+            surname, _, initial = key.partition(' ')
+            by_soundex.setdefault((soundex(surname), initial), set()).add(key)
+            by_surname.setdefault(surname, set()).add(key)
+        for name, key in bank_keys.items():
+            initial, parts = split_name(name)
+            for part in parts:
+                by_part.setdefault((part, initial), set()).add(key)
+        
+        def certify_key(name):
+            key = self.mapping['certify'].get(name)
+            if key not in known:
+                key = self._resolve_certify(name, known, by_part, by_soundex, by_surname)
+                self.mapping['certify'][name] = key
+            return key
+        return certify_key
+    
+    def resolve(self, bank_names, certify_names):
+        """Canonical keys for two Series of raw names, as two Series aligned with them"""
+        bank_keys = {name: self.bank_key(name) for name in bank_names.dropna().unique()}
+        certify_key = self.certify_resolver(bank_keys)
+        certify_keys = {name: certify_key(name) for name in certify_names.dropna().unique()}
+        known = set(bank_keys.values())
+        unresolved = sum(key not in known for key in certify_keys.values())
+        if unresolved:
+            print(f"Name resolution: {unresolved} certify names have no matching bank cardholder")
+        
+        self.save()
+        # Map as plain objects: categorical name columns cannot take '' as a new category
+        return (bank_names.astype(object).map(bank_keys).fillna(''),
+                certify_names.astype(object).map(certify_keys).fillna(''))
+    
+    def save(self):
+        """Merge this resolver's names into the mapping file.
+
+        Batch workers share one file, so the file is locked while it is re-read, merged
+        and replaced, and each writer uses its own temporary file.
+        """
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        with file_lock(self.path):
+            if os.path.exists(self.path):
+                with open(self.path) as f:
+                    on_disk = json.load(f)
+                for side in ('bank', 'certify'):
+                    self.mapping[side] = {**on_disk.get(side, {}), **self.mapping[side]}
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(self.path) + '.',
+                                            suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(self.mapping, f, indent=2, sort_keys=True)
+                replace_file(tmp_path, self.path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+def map_unique(values, func):
+    """func applied once per distinct value of a Series instead of once per row (missing values map as None)"""
+    codes, uniques = pd.factorize(values)
+    results = np.empty(len(uniques) + 1, dtype=object)
+    results[:len(uniques)] = [func(value) for value in uniques]
+    results[-1] = func(None)
+    return pd.Series(results[codes], index=values.index)
+
+def to_cents(amount):
+    """Convert a currency amount to integer cents"""
+    return int(round(float(amount) * 100))
+
+def to_cents_array(amounts):
+    """Convert a column of currency amounts to an int64 array of cents (missing amounts become 0)"""
+    values = pd.to_numeric(pd.Series(amounts), errors='coerce').to_numpy(dtype='float64')
+    return np.nan_to_num(np.round(values * 100)).astype(np.int64)
+
+# Day ordinal used for transactions without a usable date (same value NaT has as int64)
+MISSING_DATE = np.iinfo(np.int64).min
+
+def to_date_ordinals(dates):
+    """Convert a column of dates to int64 days since 1970-01-01 (MISSING_DATE where unknown)"""
+    parsed = pd.to_datetime(pd.Series(dates), errors='coerce')
+    return parsed.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+
+class TransactionArrays:
+    """Compact representation of transactions shared by the matching and zero-sum code.
+
+    Parallel arrays of amount in integer cents, original row index, name code and date
+    as a day ordinal. Name codes index into names; -1 marks a missing name.
+    """
+    __slots__ = ('cents', 'index', 'name_code', 'date_ordinal', 'names')
+
+    def __init__(self, cents, index, name_code=None, date_ordinal=None, names=()):
+        self.cents = np.asarray(cents, dtype=np.int64)
+        self.index = np.asarray(index)
+        n = len(self.cents)
+        self.name_code = (np.zeros(n, dtype=np.int64) if name_code is None
+                          else np.asarray(name_code, dtype=np.int64))
+        self.date_ordinal = (np.full(n, MISSING_DATE, dtype=np.int64) if date_ordinal is None
+                             else np.asarray(date_ordinal, dtype=np.int64))
+        self.names = names
+
+    @classmethod
+    def from_frame(cls, df, amount_col, name_col=None, date_col=None, names=None):
+        """Build from a DataFrame; pass names to share one name coding between several frames"""
+        name_code = None
+        if name_col is not None:
+            if names is None:
+                name_code, names = pd.factorize(df[name_col])
+            else:
+                name_code = pd.Categorical(df[name_col], categories=names).codes
+        date_ordinal = to_date_ordinals(df[date_col]) if date_col is not None else None
+        return cls(to_cents_array(df[amount_col]), df.index.to_numpy(), name_code, date_ordinal,
+                   names if names is not None else ())
+
+    @classmethod
+    def from_records(cls, transactions):
+        """Build from a list of {'amount': ..., 'index': ...} dicts"""
+        return cls([to_cents(t['amount']) for t in transactions], [t['index'] for t in transactions])
+
+    def __len__(self):
+        return len(self.cents)
+
+    def take(self, positions):
+        return TransactionArrays(self.cents[positions], self.index[positions], self.name_code[positions],
+                                 self.date_ordinal[positions], self.names)
+
+    def positions_by_name(self):
+        """Row positions of every name code, each in original row order"""
+        order = np.argsort(self.name_code, kind='stable')
+        codes = self.name_code[order]
+        starts = np.searchsorted(codes, np.arange(len(self.names)), side='left')
+        ends = np.searchsorted(codes, np.arange(len(self.names)), side='right')
+        return [order[start:end] for start, end in zip(starts, ends)]
+
+class CombinationMemo:
+    """LRU cache of combination search results, shared by the zero-sum and subset-sum searches.
+
+    Keys describe the whole search (kind, values, target and limits), so entries never go
+    stale; the least recently used entries are evicted beyond max_entries. Results that
+    cacheable(result) rejects, such as searches cut short by a deadline, are not kept.
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_or_compute(self, key, compute, cacheable=None):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        value = compute()
+        if cacheable is not None and not cacheable(value):
+            return value
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+    
+    def counts(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+COMBINATION_MEMO = CombinationMemo()
+
+def _combination_sums(values, members, size):
+    """All size-combinations of the given positions as an index array, together with their sums"""
+    combos = np.array(list(combinations(members, size)), dtype=np.int64).reshape(-1, size)
+    return combos, values[combos].sum(axis=1)
+
+def _suffix_sum_bounds(values, max_picks):
+    """For every start position, the smallest and largest sums of 0..max_picks values taken from values[start:]"""
+    n = len(values)
+    low = [None] * (n + 1)
+    high = [None] * (n + 1)
+    low[n] = [0]
+    high[n] = [0]
+    suffix = []
+    for start in range(n - 1, -1, -1):
+        insort(suffix, values[start])
+        picks = min(max_picks, len(suffix))
+        lows = [0]
+        highs = [0]
+        for r in range(picks):
+            lows.append(lows[-1] + suffix[r])
+            highs.append(highs[-1] + suffix[-1 - r])
+        low[start] = lows
+        high[start] = highs
+    return low, high
+
+def subset_sum_positions(values, target, max_combo_size=5, min_combo_size=1, stats=None):
+    """Find the smallest combinations of values (integer cents) whose sum is +target or -target.
+
+    Returns position tuples in the same order itertools.combinations would produce them.
+    The last member of each combination is looked up in a value table instead of being
+    enumerated, and partial sums that can no longer reach the target are pruned using the
+    smallest/largest sums still available after the current position. If a stats dict
+    is given, the number of partial combinations examined is added to stats['combinations'].
+    Results are memoized in COMBINATION_MEMO, so a repeated search costs one lookup.
+    """
+    key = ('subset_sum', tuple(values), abs(target), max_combo_size, min_combo_size)
+    return list(COMBINATION_MEMO.get_or_compute(
+        key, lambda: _subset_sum_search(values, target, max_combo_size, min_combo_size, stats)
+    ))
+
+def _subset_sum_search(values, target, max_combo_size, min_combo_size, stats):
+    n = len(values)
+    target = abs(target)
+    if target == 0 or n == 0:
+        return []
+    examined = 0
+
+    targets = (target, -target)
+    positions_by_value = {}
+    for pos, value in enumerate(values):
+        positions_by_value.setdefault(value, []).append(pos)
+    low, high = _suffix_sum_bounds(values, max_combo_size)
+
+    def reachable(partial, start, picks):
+        if picks >= len(low[start]):
+            return False
+        lo = partial + low[start][picks]
+        hi = partial + high[start][picks]
+        return any(lo <= t <= hi for t in targets)
+
+    def search(start, picks, partial, chosen, results):
+        nonlocal examined
+        examined += 1
+        if picks == 1:
+            last_positions = []
+            for t in targets:
+                candidates = positions_by_value.get(t - partial)
+                if candidates:
+                    last_positions.extend(candidates[bisect_left(candidates, start):])
+            for pos in sorted(last_positions):
+                results.append(chosen + (pos,))
+            return
+
+        for pos in range(start, n - picks + 1):
+            next_partial = partial + values[pos]
+            if reachable(next_partial, pos + 1, picks - 1):
+                search(pos + 1, picks - 1, next_partial, chosen + (pos,), results)
+
+    results = []
+    for size in range(min_combo_size, min(max_combo_size, n) + 1):
+        if not reachable(0, 0, size):
+            continue
+        search(0, size, 0, (), results)
+        if results:
+            break
+
+    if stats is not None:
+        stats['combinations'] = stats.get('combinations', 0) + examined
+    return results
+
+def find_sum_combinations(transactions, target_sum, max_combo_size=5):
+    """Find combinations of transactions that sum to target amount, smallest combinations first.
+
+    transactions is a TransactionArrays or a list of {'amount': ..., 'index': ...} dicts;
+    combinations are returned as lists of row indices.
+    """
+    target_cents = abs(to_cents(target_sum))
+    if target_cents == 0:
+        return []
+
+    if not isinstance(transactions, TransactionArrays):
+        transactions = TransactionArrays.from_records(transactions)
+    order = np.argsort(np.abs(transactions.cents), kind='stable')
+    values = transactions.cents[order].tolist()
+    row_index = transactions.index[order].tolist()
+
+    return [[row_index[i] for i in combo]
+            for combo in subset_sum_positions(values, target_cents, max_combo_size)]
+
+# Largest number of combinations a single sum table may hold
+MAX_TABLE_ENTRIES = 1000000
+
+class CombinationSumIndex:
+    """Combination sums of one person's open transactions, keyed by integer cents.
+
+    Small combinations are enumerated once into per-size sum tables and every target
+    amount is answered by lookup. Larger combinations are assembled meet-in-the-middle
+    style: each small head combination looks up the tail it needs in a sum table.
+    Transactions passed to consume() are dropped from the tables the next time a
+    lookup runs into them.
+    """
+
+    def __init__(self, transactions, max_combo_size=5, table_size=3):
+        order = np.argsort(np.abs(transactions.cents), kind='stable')
+        self.values = transactions.cents[order]
+        self.row_index = transactions.index[order].tolist()
+        self.max_combo_size = max_combo_size
+        n = len(self.values)
+        self.table_size = min(table_size, max_combo_size)
+        while self.table_size > 1 and math.comb(n, self.table_size) > MAX_TABLE_ENTRIES:
+            self.table_size -= 1
+        self._positions = {idx: pos for pos, idx in enumerate(self.row_index)}
+        self._consumed = set()
+        self._tables = {}
+        self._heads = {}
+        self.stats = {'combinations': 0}
+
+    def _open_positions(self):
+        return [pos for pos in range(len(self.values)) if pos not in self._consumed]
+
+    def _table(self, size):
+        """Sum table for combinations of the given size, built on first use"""
+        table = self._tables.get(size)
+        if table is None:
+            table = {}
+            combos, sums = _combination_sums(self.values, self._open_positions(), size)
+            for combo, total in zip(combos.tolist(), sums.tolist()):
+                table.setdefault(total, []).append(tuple(combo))
+            self._tables[size] = table
+            self.stats['combinations'] += len(sums)
+        return table
+
+    def _head_combinations(self, size):
+        """All combinations of the given size as (positions, sum), in itertools.combinations order"""
+        heads = self._heads.get(size)
+        if heads is None:
+            combos, sums = _combination_sums(self.values, self._open_positions(), size)
+            heads = [(tuple(combo), total) for combo, total in zip(combos.tolist(), sums.tolist())]
+            self._heads[size] = heads
+            self.stats['combinations'] += len(heads)
+        return heads
+
+    def _table_lookup(self, size, target):
+        table = self._table(size)
+        consumed = self._consumed
+        found = []
+        for key in (target, -target):
+            entries = table.get(key)
+            if not entries:
+                continue
+            live = [combo for combo in entries if consumed.isdisjoint(combo)]
+            if live:
+                table[key] = live
+                found.extend(live)
+            else:
+                del table[key]
+        found.sort()
+        return found
+
+    def _split_lookup(self, size, target):
+        """Open combinations of a size beyond the tables, built as a head plus a tail from a sum table"""
+        tail_size = min(self.table_size, size - 1)
+        tail_table = self._table(tail_size)
+        consumed = self._consumed
+        found = []
+        examined = 0
+        for head, total in self._head_combinations(size - tail_size):
+            if not consumed.isdisjoint(head):
+                continue
+            tails = []
+            for key in (target - total, -target - total):
+                entries = tail_table.get(key, ())
+                examined += len(entries)
+                for tail in entries:
+                    if tail[0] > head[-1] and consumed.isdisjoint(tail):
+                        tails.append(tail)
+            tails.sort()
+            found.extend(head + tail for tail in tails)
+        self.stats['combinations'] += examined
+        return found
+
+    def lookup(self, target, allowed=None, min_size=1):
+        """Open combinations of the smallest possible size whose sum is +/- target cents, as row indices.
+
+        allowed, if given, restricts the members to those row indices; such a candidate set
+        is expected to be small, so it is searched directly instead of through the tables.
+        Combinations smaller than min_size are not considered.
+        """
+        target = abs(int(target))
+        if target == 0:
+            return []
+        
+        if allowed is not None:
+            positions = sorted(pos for pos in (self._positions.get(idx) for idx in allowed)
+                               if pos is not None and pos not in self._consumed)
+            combos = subset_sum_positions(self.values[positions].tolist(), target, self.max_combo_size,
+                                          min_size, self.stats)
+            return [[self.row_index[positions[i]] for i in combo] for combo in combos]
+
+        n = len(self.values) - len(self._consumed)
+        combos = []
+        for size in range(min_size, min(self.table_size, n) + 1):
+            combos = self._table_lookup(size, target)
+            if combos:
+                break
+
+        for size in range(max(self.table_size + 1, min_size), min(self.max_combo_size, n) + 1):
+            if combos:
+                break
+            if size - self.table_size <= self.table_size:
+                combos = self._split_lookup(size, target)
+            else:
+                open_positions = self._open_positions()
+                combos = [tuple(open_positions[i] for i in combo)
+                          for combo in subset_sum_positions(self.values[open_positions].tolist(), target,
+                                                            size, min_combo_size=size, stats=self.stats)]
+
+        return [[self.row_index[pos] for pos in combo] for combo in combos]
+
+    def consume(self, indices):
+        """Mark transactions as matched so later lookups no longer return them"""
+        for idx in indices:
+            pos = self._positions.get(idx)
+            if pos is not None:
+                self._consumed.add(pos)
+
+def _amount_rank_keys(trans):
+    """Per-row (name code, cents, occurrence rank) keys for the non-zero amounts of named transactions"""
+    keys = pd.DataFrame({
+        'NAME': trans.name_code,
+        'CENTS': trans.cents,
+        'INDEX': trans.index
+    })
+    keys = keys[(keys['CENTS'] != 0) & (keys['NAME'] >= 0)]
+    keys['RANK'] = keys.groupby(['NAME', 'CENTS'], sort=False).cumcount()
+    return keys
+
+def find_exact_matches(bank, certify):
+    """Pair bank and certify transactions with identical amounts for each name code.
+
+    The n-th bank row of an amount is paired with the n-th certify row of the same
+    amount, in original row order, and pairs are grouped per (name, amount) in order
+    of the amount's first appearance in the bank data. Both TransactionArrays must
+    share one name coding. Returns a dict of name code -> list of matched groups.
+    """
+    pairs = _amount_rank_keys(bank).merge(
+        _amount_rank_keys(certify),
+        on=['NAME', 'CENTS', 'RANK'],
+        how='inner',
+        suffixes=('_BANK', '_CERTIFY')
+    )
+    
+    exact_groups = {}
+    grouped = pairs.groupby(['NAME', 'CENTS'], sort=False).agg(
+        bank_indices=('INDEX_BANK', list),
+        certify_indices=('INDEX_CERTIFY', list)
+    )
+    for (code, cents), group in zip(grouped.index, grouped.itertuples(index=False)):
+        exact_groups.setdefault(code, []).append({
+            'bank_indices': group.bank_indices,
+            'certify_indices': group.certify_indices,
+            'amount': cents / 100,
+            'last_name': bank.names[code]
+        })
+    return exact_groups
+
+class DateWindowIndex:
+    """Row indices of one side's transactions dated within window_days of a given day.
+
+    Dates are kept as a sorted ordinal array searched by bisection. Undated transactions
+    cannot be ruled out, so they are in every window, and an undated target sees every row.
+    """
+
+    def __init__(self, trans, window_days):
+        self.window_days = window_days
+        dated = np.flatnonzero(trans.date_ordinal != MISSING_DATE)
+        order = dated[np.argsort(trans.date_ordinal[dated], kind='stable')]
+        self.days = trans.date_ordinal[order]
+        self.rows = trans.index[order]
+        self.undated = trans.index[trans.date_ordinal == MISSING_DATE].tolist()
+        self.all_rows = trans.index.tolist()
+
+    def rows_near(self, day):
+        if day == MISSING_DATE:
+            return self.all_rows
+        lo = np.searchsorted(self.days, day - self.window_days, side='left')
+        hi = np.searchsorted(self.days, day + self.window_days, side='right')
+        return self.rows[lo:hi].tolist() + self.undated
+
+def _rows_by_cents(trans):
+    """Row indices of every amount, in original row order and in order of first appearance"""
+    rows = {}
+    for cents, idx in zip(trans.cents.tolist(), trans.index.tolist()):
+        rows.setdefault(cents, []).append(idx)
+    return rows
+
+def _first_open(rows, processed):
+    for idx in rows:
+        if idx not in processed:
+            return idx
+    return None
+
+def _target_combinations(index, cents, rows, processed, window=None, days=None):
+    """(target row, candidate combination) pairs for one target amount, drawn lazily.
+
+    Without a date window every open row with this amount takes the next combination from
+    one shared list; with one, each row looks up combinations among the rows dated near it.
+    """
+    if window is None:
+        for combo in index.lookup(cents):
+            idx = _first_open(rows, processed)
+            if idx is None:
+                return
+            yield idx, combo
+        return
+    
+    for idx in rows:
+        if idx in processed:
+            continue
+        for combo in index.lookup(cents, window.rows_near(days[idx])):
+            yield idx, combo
+            if idx in processed:
+                break
+
+def match_sum_combinations(last_name, bank, certify, check_cancelled=None, stats=None, date_window_days=None):
+    """Second pass for one person: match single transactions against sum combinations on the other side.
+
+    bank and certify are the person's still-unmatched transactions as TransactionArrays.
+    check_cancelled, if given, is called before every target amount and may raise
+    ReconciliationCancelled. If a stats dict is given, the number of combinations
+    evaluated is added to stats['combinations']. With date_window_days, a combination
+    may only use rows dated within that many days of the row it matches.
+    Returns the matched groups in match order.
+    """
+    matched_groups = []
+    processed_bank_indices = set()
+    processed_certify_indices = set()
+    
+    bank_rows = _rows_by_cents(bank)
+    certify_rows = _rows_by_cents(certify)
+    
+    # Combination sums are enumerated once per person and shared by every target amount
+    bank_index = CombinationSumIndex(bank)
+    certify_index = CombinationSumIndex(certify)
+    
+    bank_window = certify_window = bank_days = certify_days = None
+    if date_window_days is not None:
+        bank_window = DateWindowIndex(bank, date_window_days)
+        certify_window = DateWindowIndex(certify, date_window_days)
+        bank_days = dict(zip(bank.index.tolist(), bank.date_ordinal.tolist()))
+        certify_days = dict(zip(certify.index.tolist(), certify.date_ordinal.tolist()))
+    
+    for certify_cents, rows in certify_rows.items():
+        if certify_cents == 0:
+            continue
+        if check_cancelled is not None:
+            check_cancelled()
+        for certify_idx, bank_combo in _target_combinations(bank_index, certify_cents, rows, processed_certify_indices,
+                                                            bank_window, certify_days):
+            if processed_bank_indices.isdisjoint(bank_combo):
+                matched_groups.append({
+                    'bank_indices': bank_combo,
+                    'certify_indices': [certify_idx],
+                    'amount': certify_cents / 100,
+                    'last_name': last_name
+                })
+                processed_bank_indices.update(bank_combo)
+                processed_certify_indices.add(certify_idx)
+                bank_index.consume(bank_combo)
+                certify_index.consume([certify_idx])
+    
+    for bank_cents, rows in bank_rows.items():
+        if bank_cents == 0:
+            continue
+        if check_cancelled is not None:
+            check_cancelled()
+        for bank_idx, certify_combo in _target_combinations(certify_index, bank_cents, rows, processed_bank_indices,
+                                                            certify_window, bank_days):
+            if processed_certify_indices.isdisjoint(certify_combo):
+                matched_groups.append({
+                    'bank_indices': [bank_idx],
+                    'certify_indices': certify_combo,
+                    'amount': bank_cents / 100,
+                    'last_name': last_name
+                })
+                processed_bank_indices.add(bank_idx)
+                processed_certify_indices.update(certify_combo)
+                bank_index.consume([bank_idx])
+                certify_index.consume(certify_combo)
+    
+    if stats is not None:
+        stats['combinations'] = (stats.get('combinations', 0) + bank_index.stats['combinations']
+                                 + certify_index.stats['combinations'])
+    return matched_groups
+
+# Optimal engine: per-cardholder candidate groups packed for the most matched rows
+ROW_WEIGHT = 100000
+MISSING_DATE_COST = 30
+MAX_SPLIT_CANDIDATES = 20
+MAX_PACKING_ROWS = 400
+
+def _date_cost(target_day, member_days):
+    """Largest distance in days between a target row and its members"""
+    if target_day == MISSING_DATE or MISSING_DATE in member_days:
+        return MISSING_DATE_COST
+    return max(abs(target_day - day) for day in member_days)
+
+def _split_candidates(target, members, max_combo_size, window, stats):
+    """(target row, member rows) for each combination of 2+ member rows summing to a target row's amount"""
+    index = CombinationSumIndex(members, max_combo_size)
+    by_cents = {}
+    for idx, cents, day in zip(target.index.tolist(), target.cents.tolist(), target.date_ordinal.tolist()):
+        if cents == 0:
+            continue
+        if window is None:
+            combos = by_cents.get(cents)
+            if combos is None:
+                combos = by_cents[cents] = index.lookup(cents, min_size=2)[:MAX_SPLIT_CANDIDATES]
+        else:
+            combos = index.lookup(cents, window.rows_near(day), min_size=2)[:MAX_SPLIT_CANDIDATES]
+        for combo in combos:
+            yield idx, combo
+    stats['combinations'] = stats.get('combinations', 0) + index.stats['combinations']
+
+def _assign_pairs(pairs, bank_rows, certify_rows):
+    """Min-cost assignment of bank to certify rows over candidate pairs with scipy, keeping as many as possible"""
+    from scipy.optimize import linear_sum_assignment
+    
+    bank_pos = {row: i for i, row in enumerate(bank_rows)}
+    certify_pos = {row: j for j, row in enumerate(certify_rows)}
+    # Any infeasible entry costs more than all feasible ones together, so the number of pairs is maximised first
+    infeasible = ROW_WEIGHT * (len(pairs) + 1)
+    cost = np.full((len(bank_rows), len(certify_rows)), infeasible, dtype=np.int64)
+    for (bank_idx, certify_idx), pair_cost in pairs.items():
+        cost[bank_pos[bank_idx], certify_pos[certify_idx]] = pair_cost
+    chosen = []
+    for i, j in zip(*linear_sum_assignment(cost)):
+        if cost[i, j] < infeasible:
+            chosen.append((bank_rows[i], certify_rows[j]))
+    return chosen
+
+def _pack_groups(candidates, deadline):
+    """Branch and bound over candidate groups: the disjoint selection with the highest total weight.
+
+    candidates are (rows, weight, group) tuples. Rows with the fewest candidates are decided
+    first; each row is covered by one of its candidates or left open, and a branch is cut
+    when even the best share of every undecided row cannot beat the best selection so far.
+    The search starts from the _greedy_pack selection and only replaces it with a better one.
+    Returns (groups, complete) where complete is False if the deadline cut the search short.
+    """
+    by_row = {}
+    for candidate in candidates:
+        for row in candidate[0]:
+            by_row.setdefault(row, []).append(candidate)
+    for row_candidates in by_row.values():
+        row_candidates.sort(key=lambda c: -c[1])
+    order = sorted(by_row, key=lambda row: len(by_row[row]))
+    share = [max(c[1] / len(c[0]) for c in by_row[row]) for row in order]
+    
+    used = set()
+    chosen = []
+    groups, weight = _greedy_pack(candidates)
+    best = {'weight': weight, 'groups': groups}
+    complete = True
+    
+    def search(k, weight):
+        nonlocal complete
+        while k < len(order) and order[k] in used:
+            k += 1
+        if k == len(order):
+            if weight > best['weight']:
+                best['weight'] = weight
+                best['groups'] = list(chosen)
+            return
+        if time.perf_counter() > deadline:
+            complete = False
+            return
+        if weight + sum(s for row, s in zip(order[k:], share[k:]) if row not in used) <= best['weight']:
+            return
+        for rows, candidate_weight, group in by_row[order[k]]:
+            if used.isdisjoint(rows):
+                used.update(rows)
+                chosen.append(group)
+                search(k + 1, weight + candidate_weight)
+                chosen.pop()
+                used.difference_update(rows)
+        search(k + 1, weight)
+    
+    search(0, 0)
+    return best['groups'], complete
+
+def _greedy_pack(candidates):
+    """Smallest groups first, closest dates first, skipping any that overlap one already taken.
+
+    This mirrors the greedy engine's preference for exact pairs over splits. Returns (groups, weight).
+    """
+    used = set()
+    groups = []
+    total = 0
+    for rows, weight, group in sorted(candidates, key=lambda c: (len(c[0]), -c[1])):
+        if used.isdisjoint(rows):
+            used.update(rows)
+            groups.append(group)
+            total += weight
+    return groups, total
+
+def _candidate_components(candidates):
+    """Split candidates into groups of candidates connected through shared rows"""
+    parent = {}
+    
+    def find(row):
+        while parent.setdefault(row, row) != row:
+            parent[row] = parent[parent[row]]
+            row = parent[row]
+        return row
+    
+    for rows, _, _ in candidates:
+        first = find(rows[0])
+        for row in rows[1:]:
+            parent[find(row)] = first
+    components = {}
+    for candidate in candidates:
+        components.setdefault(find(candidate[0][0]), []).append(candidate)
+    return list(components.values())
+
+def optimal_match_cardholder(last_name, bank, certify, date_window_days=None, time_budget=OPTIMAL_TIME_BUDGET,
+                             max_combo_size=5, stats=None):
+    """Match one cardholder's transactions as a whole instead of first come, first served.
+
+    Candidates are exact pairs (same amount) and splits (one row against 2+ rows on the
+    other side that add up to it), each weighted by the rows it matches less its date
+    distance. Components joined only by exact pairs are solved as a min-cost assignment
+    with scipy when it is installed; the rest are packed by branch and bound within
+    time_budget seconds (then falling back to the best packing found). Returns matched
+    groups in the same format as the greedy engine.
+    """
+    stats = stats if stats is not None else {}
+    deadline = time.perf_counter() + time_budget
+    bank_days = dict(zip(bank.index.tolist(), bank.date_ordinal.tolist()))
+    certify_days = dict(zip(certify.index.tolist(), certify.date_ordinal.tolist()))
+    bank_cents = dict(zip(bank.index.tolist(), bank.cents.tolist()))
+    certify_cents = dict(zip(certify.index.tolist(), certify.cents.tolist()))
+    
+    # Rows are keyed ('B', index) / ('C', index) so both sides share one namespace
+    candidates = []
+    certify_by_cents = {}
+    for idx, cents in certify_cents.items():
+        certify_by_cents.setdefault(cents, []).append(idx)
+    for bank_idx, cents in bank_cents.items():
+        for certify_idx in certify_by_cents.get(cents, ()) if cents else ():
+            bank_day, certify_day = bank_days[bank_idx], certify_days[certify_idx]
+            cost = _date_cost(bank_day, [certify_day])
+            dated = bank_day != MISSING_DATE and certify_day != MISSING_DATE
+            if date_window_days is None or not dated or cost <= date_window_days:
+                candidates.append(((('B', bank_idx), ('C', certify_idx)), 2 * ROW_WEIGHT - cost,
+                                   ('pair', bank_idx, certify_idx)))
+    
+    bank_window = certify_window = None
+    if date_window_days is not None:
+        bank_window = DateWindowIndex(bank, date_window_days)
+        certify_window = DateWindowIndex(certify, date_window_days)
+    for certify_idx, combo in _split_candidates(certify, bank, max_combo_size, bank_window, stats):
+        rows = (('C', certify_idx),) + tuple(('B', idx) for idx in combo)
+        cost = _date_cost(certify_days[certify_idx], [bank_days[idx] for idx in combo])
+        candidates.append((rows, len(rows) * ROW_WEIGHT - cost, ('split', combo, [certify_idx])))
+    for bank_idx, combo in _split_candidates(bank, certify, max_combo_size, certify_window, stats):
+        rows = (('B', bank_idx),) + tuple(('C', idx) for idx in combo)
+        cost = _date_cost(bank_days[bank_idx], [certify_days[idx] for idx in combo])
+        candidates.append((rows, len(rows) * ROW_WEIGHT - cost, ('split', [bank_idx], combo)))
+    stats['combinations'] = stats.get('combinations', 0) + len(candidates)
+    
+    scipy_available = importlib.util.find_spec('scipy') is not None
+    selected = []
+    complete = True
+    for component in _candidate_components(candidates):
+        if scipy_available and all(group[0] == 'pair' for _, _, group in component):
+            pairs = {(group[1], group[2]): 2 * ROW_WEIGHT - weight for _, weight, group in component}
+            bank_rows = sorted({bank_idx for bank_idx, _ in pairs})
+            certify_rows = sorted({certify_idx for _, certify_idx in pairs})
+            selected.extend(('pair', bank_idx, certify_idx)
+                            for bank_idx, certify_idx in _assign_pairs(pairs, bank_rows, certify_rows))
+        elif len({row for rows, _, _ in component for row in rows}) > MAX_PACKING_ROWS:
+            selected.extend(_greedy_pack(component)[0])
+            complete = False
+        else:
+            groups, component_complete = _pack_groups(component, deadline)
+            selected.extend(groups)
+            complete = complete and component_complete
+    stats['complete'] = complete
+    
+    # Exact pairs are reported per amount, like the greedy engine's exact pass
+    matched_groups = []
+    pairs_by_cents = {}
+    for _, bank_idx, certify_idx in sorted(group for group in selected if group[0] == 'pair'):
+        bank_indices, certify_indices = pairs_by_cents.setdefault(bank_cents[bank_idx], ([], []))
+        bank_indices.append(bank_idx)
+        certify_indices.append(certify_idx)
+    for cents, (bank_indices, certify_indices) in pairs_by_cents.items():
+        matched_groups.append({
+            'bank_indices': bank_indices,
+            'certify_indices': certify_indices,
+            'amount': cents / 100,
+            'last_name': last_name
+        })
+    splits = sorted((group for group in selected if group[0] == 'split'), key=lambda g: (g[1][0], g[2][0]))
+    for _, bank_indices, certify_indices in splits:
+        # The amount is the single row the combination adds up to
+        target_cents = certify_cents[certify_indices[0]] if len(certify_indices) == 1 else bank_cents[bank_indices[0]]
+        matched_groups.append({
+            'bank_indices': list(bank_indices),
+            'certify_indices': list(certify_indices),
+            'amount': target_cents / 100,
+            'last_name': last_name
+        })
+    return matched_groups
+
+def _match_task(task, check_cancelled=None):
+    """Process pool entry point for one cardholder's matching with either engine; returns (groups, stats)"""
+    last_name, bank, certify, options = task
+    stats = {'combinations': 0}
+    start = time.perf_counter()
+    if options['engine'] == 'optimal':
+        if check_cancelled is not None:
+            check_cancelled()
+        groups = optimal_match_cardholder(last_name, bank, certify, options['date_window_days'],
+                                          options['time_budget'], stats=stats)
+    else:
+        groups = match_sum_combinations(last_name, bank, certify, check_cancelled=check_cancelled, stats=stats,
+                                        date_window_days=options['date_window_days'])
+    stats['seconds'] = time.perf_counter() - start
+    return groups, stats
+
+def _combination_cost(task):
+    """Rough cost of a person's combination pass: the size of the triple sum tables on both sides"""
+    bank, certify = task[1], task[2]
+    return math.comb(len(bank), 3) + math.comb(len(certify), 3)
+
+# Columns find_matching_groups adds to both input frames
+DERIVED_COLUMNS = ['LAST_NAME', 'AMOUNT']
+
+def find_matching_groups(bank_df, certify_df, workers=1, monitor=None, date_window_days=None, name_resolver=None,
+                         engine='greedy', time_budget=OPTIMAL_TIME_BUDGET):
+    """Find matching groups of transactions with stricter matching tolerance.
+
+    Each last name is matched independently, so with workers > 1 the combination pass
+    runs on a process pool, heaviest cardholders first. Results are merged back in the
+    same order as a serial run. An optional PipelineMonitor receives stage progress and
+    can cancel the combination pass between cardholders (and between target amounts
+    when running serially). Per-cardholder timings and combination counts are added
+    to the monitor's profile. date_window_days limits combination members to rows
+    dated within that many days of the transaction they add up to. With a NameResolver,
+    cardholders are grouped by resolved key instead of by bare last name. engine='optimal'
+    replaces both passes with optimal_match_cardholder, given time_budget seconds per
+    cardholder.
+    """
+    if engine not in MATCH_ENGINES:
+        raise ValueError(f"Unknown matching engine '{engine}', expected one of {', '.join(MATCH_ENGINES)}")
+    monitor = monitor or PipelineMonitor()
+    if name_resolver is None:
+        bank_df['LAST_NAME'] = map_unique(bank_df['ACC.ACCOUNT NAME'], get_last_name)
+        certify_df['LAST_NAME'] = map_unique(certify_df['Employee'], get_last_name)
+    else:
+        bank_df['LAST_NAME'], certify_df['LAST_NAME'] = name_resolver.resolve(bank_df['ACC.ACCOUNT NAME'],
+                                                                              certify_df['Employee'])
+    
+    # Cardholders are processed in order of first appearance in the bank data
+    names = pd.Index(bank_df['LAST_NAME'].unique())
+    bank = TransactionArrays.from_frame(bank_df, 'FIN.TRANSACTION AMOUNT', 'LAST_NAME', 'FIN.POSTING DATE', names)
+    certify = TransactionArrays.from_frame(certify_df, 'USD Amt', 'LAST_NAME', 'Processed Date', names)
+    
+    bank_df['AMOUNT'] = bank.cents / 100
+    certify_df['AMOUNT'] = certify.cents / 100
+    
+    # First pass: Exact matches, computed for everyone at once (the optimal engine weighs them per cardholder)
+    monitor.report('exact_match', f"{len(names)} cardholders")
+    with monitor.profile.stage('exact_match', rows_in=len(bank) + len(certify)) as record:
+        exact_groups = find_exact_matches(bank, certify) if engine == 'greedy' else {}
+        record['rows_out'] = sum(len(group['bank_indices']) + len(group['certify_indices'])
+                                 for groups in exact_groups.values() for group in groups)
+    
+    # Second pass: Sum combinations over whatever the exact pass left open
+    options = {'engine': engine, 'date_window_days': date_window_days, 'time_budget': time_budget}
+    bank_positions = bank.positions_by_name()
+    certify_positions = certify.positions_by_name()
+    codes = []
+    tasks = []
+    for code, last_name in enumerate(names):
+        if not len(certify_positions[code]):
+            continue
+        codes.append(code)
+        
+        processed_bank_indices = []
+        processed_certify_indices = []
+        for group in exact_groups.get(code, []):
+            processed_bank_indices.extend(group['bank_indices'])
+            processed_certify_indices.extend(group['certify_indices'])
+        
+        bank_open = bank_positions[code]
+        bank_open = bank_open[~np.isin(bank.index[bank_open], processed_bank_indices)]
+        certify_open = certify_positions[code]
+        certify_open = certify_open[~np.isin(certify.index[certify_open], processed_certify_indices)]
+        if len(bank_open) and len(certify_open):
+            tasks.append((last_name, bank.take(bank_open), certify.take(certify_open), options))
+    
+    combo_groups = {}
+    combo_stats = {}
+    monitor.report('combo_match', f"0/{len(tasks)} cardholders")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    with monitor.profile.stage('combo_match', rows_in=sum(len(task[1]) + len(task[2]) for task in tasks)) as record:
+        if workers > 1 and len(tasks) > 1:
+            executor = ProcessPoolExecutor(max_workers=min(workers, len(tasks)))
+            try:
+                futures = {executor.submit(_match_task, task): task[0]
+                           for task in sorted(tasks, key=_combination_cost, reverse=True)}
+                for future in as_completed(futures):
+                    combo_groups[futures[future]], combo_stats[futures[future]] = future.result()
+                    monitor.report('combo_match', f"{len(combo_groups)}/{len(tasks)} cardholders")
+            finally:
+                executor.shutdown(wait=not monitor.cancelled, cancel_futures=True)
+        else:
+            for task in tasks:
+                combo_groups[task[0]], combo_stats[task[0]] = _match_task(task, monitor.check_cancelled)
+                monitor.report('combo_match', f"{len(combo_groups)}/{len(tasks)} cardholders")
+        
+        for last_name, bank_trans, certify_trans, _ in tasks:
+            stats = combo_stats[last_name]
+            monitor.profile.add_cardholder(last_name, len(bank_trans), len(certify_trans), stats['seconds'],
+                                           stats['combinations'], len(combo_groups[last_name]))
+        record['rows_out'] = sum(len(group['bank_indices']) + len(group['certify_indices'])
+                                 for groups in combo_groups.values() for group in groups)
+        record['combinations'] = sum(stats['combinations'] for stats in combo_stats.values())
+    
+    if engine == 'optimal':
+        over_budget = sum(not stats['complete'] for stats in combo_stats.values())
+        if over_budget:
+            print(f"Optimal engine: {over_budget} of {len(tasks)} cardholders used the best matching found "
+                  f"within {time_budget}s")
+    
+    matched_groups = []
+    for code in codes:
+        matched_groups.extend(exact_groups.get(code, []))
+        matched_groups.extend(combo_groups.get(names[code], []))
+    
+    return matched_groups
+
+def find_zero_sum_combinations(values, max_group_size=4, max_evaluations=250000, time_budget=2.0, stats=None):
+    """Find disjoint combinations of 3..max_group_size values (integer cents) that sum to zero.
+
+    A zero-sum combination needs both positive and negative members, so each size is
+    split into p positives and q negatives: the p-combination sums of the positives
+    are looked up against the q-combination sums of the negatives instead of trying
+    every mixed combination. The search stops once more than max_evaluations partial
+    combinations would be enumerated or time_budget seconds have passed.
+
+    Returns (positions, complete) where positions are the members of the combinations
+    found and complete is False if the search was cut short by the budget. If a stats
+    dict is given, the partial combinations enumerated are added to stats['combinations'].
+    
+    The search runs on the values in sorted order and is memoized in COMBINATION_MEMO by
+    that multiset, so a group that comes back unchanged (the unmatched-row cleanup sees
+    most groups a second time) is not searched again. Incomplete results depend on the
+    time budget and are not memoized.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    order = np.argsort(values, kind='stable')
+    key = ('zero_sum', values[order].tobytes(), max_group_size, max_evaluations)
+    positions, complete = COMBINATION_MEMO.get_or_compute(
+        key, lambda: _zero_sum_search(values[order], max_group_size, max_evaluations, time_budget, stats),
+        cacheable=lambda result: result[1]
+    )
+    return sorted(order[positions].tolist()), complete
+
+def _zero_sum_search(values, max_group_size, max_evaluations, time_budget, stats):
+    deadline = time.perf_counter() + time_budget
+    used = set()
+    evaluations = 0
+    
+    for size in range(3, min(max_group_size, len(values)) + 1):
+        for n_pos in range(1, size):
+            n_neg = size - n_pos
+            open_pos = [i for i in np.flatnonzero(values > 0).tolist() if i not in used]
+            open_neg = [i for i in np.flatnonzero(values < 0).tolist() if i not in used]
+            if n_pos > len(open_pos) or n_neg > len(open_neg):
+                continue
+            
+            cost = math.comb(len(open_pos), n_pos) + math.comb(len(open_neg), n_neg)
+            evaluations += cost
+            if evaluations > max_evaluations or time.perf_counter() > deadline:
+                return sorted(used), False
+            if stats is not None:
+                stats['combinations'] = stats.get('combinations', 0) + cost
+            
+            pos_combos, pos_sums = _combination_sums(values, open_pos, n_pos)
+            neg_combos, neg_sums = _combination_sums(values, open_neg, n_neg)
+            neg_sums = -neg_sums
+            hits = np.flatnonzero(np.isin(pos_sums, neg_sums))
+            if not hits.size:
+                continue
+            
+            neg_by_sum = {}
+            for j in np.flatnonzero(np.isin(neg_sums, pos_sums[hits])).tolist():
+                neg_by_sum.setdefault(int(neg_sums[j]), []).append(neg_combos[j].tolist())
+            
+            for i in hits.tolist():
+                pos_combo = pos_combos[i].tolist()
+                if not used.isdisjoint(pos_combo):
+                    continue
+                for neg_combo in neg_by_sum[int(pos_sums[i])]:
+                    if used.isdisjoint(neg_combo):
+                        used.update(pos_combo)
+                        used.update(neg_combo)
+                        break
+    
+    return sorted(used), True
+
+def remove_zero_sum_groups(df, name_col, amount_col, desc_col=None, date_col=None, max_group_size=4,
+                           max_evaluations=250000, time_budget=2.0, monitor=None):
+    """Remove groups of transactions that sum to zero for each person (and posting date, if given).
+
+    Groups whose combination search runs over the per-group budget keep their leftover
+    rows; they are reported and listed in the result's attrs['skipped_zero_sum_groups'].
+    The number of combinations evaluated is stored in attrs['zero_sum_combinations'].
+    """
+    trans = TransactionArrays.from_frame(df, amount_col, name_col, date_col)
+    group_cols = ['NAME', 'DATE'] if date_col else ['NAME']
+    
+    keys = pd.DataFrame({
+        'NAME': trans.name_code,
+        'DATE': trans.date_ordinal,
+        'CENTS': trans.cents,
+        'INDEX': trans.index
+    })
+    keys = keys[(keys['NAME'] >= 0) & (keys['CENTS'] != 0)]
+    if date_col:
+        keys = keys[keys['DATE'] != MISSING_DATE]
+    
+    # Direct positive/negative pairs: the n-th +x of a group cancels the n-th -x
+    keys['RANK'] = keys.groupby(group_cols + ['CENTS'], sort=False).cumcount()
+    positive = keys[keys['CENTS'] > 0]
+    negative = keys[keys['CENTS'] < 0].assign(CENTS=lambda x: -x['CENTS'])
+    pairs = positive.merge(negative, on=group_cols + ['CENTS', 'RANK'], suffixes=('_POS', '_NEG'))
+    removed_indices = set(pairs['INDEX_POS']) | set(pairs['INDEX_NEG'])
+    
+    # Leftovers can only cancel out in groups that still hold both signs
+    leftover = keys[~keys['INDEX'].isin(removed_indices)]
+    by_group = leftover.groupby(group_cols, sort=False)['CENTS']
+    mixed_signs = (by_group.transform('min') < 0) & (by_group.transform('max') > 0)
+    skipped_groups = []
+    stats = {'combinations': 0}
+    for key, group in leftover[mixed_signs].groupby(group_cols, sort=False):
+        if monitor is not None:
+            monitor.check_cancelled()
+        positions, complete = find_zero_sum_combinations(
+            group['CENTS'].to_numpy(), max_group_size, max_evaluations, time_budget, stats
+        )
+        removed_indices.update(group['INDEX'].iloc[positions])
+        if not complete:
+            label = (trans.names[key[0]],) + tuple(str(np.datetime64(day, 'D')) for day in key[1:])
+            skipped_groups.append(label)
+            print(f"Zero-sum search skipped for {' / '.join(str(k) for k in label)}: "
+                  f"{len(group)} transactions exceed the search budget")
+    
+    # Remove the identified zero-sum groups
+    removed_mask = df.index.isin(list(removed_indices))
+    if removed_indices:
+        print("\nRemoving zero-sum transactions:")
+        for name, amount in zip(df.loc[removed_mask, name_col], df.loc[removed_mask, amount_col]):
+            print(f"{name}: {amount}")
+        
+    result_df = df.loc[~removed_mask].copy()
+    result_df.attrs['skipped_zero_sum_groups'] = skipped_groups
+    result_df.attrs['zero_sum_combinations'] = stats['combinations']
+    return result_df
+
+# RBT at the start or end of a bank description marks a rebate line
+RBT_PATTERN = re.compile(r'^RBT\s|^RBT$|\sRBT\s*$', re.IGNORECASE)
+BANK_CATEGORICAL_COLUMNS = ['ACC.ACCOUNT NAME', 'FIN.TRANSACTION DESCRIPTION']
+CERTIFY_CATEGORICAL_COLUMNS = ['Employee', 'Vendor']
+
+def _as_categorical(df, columns):
+    """Store repeated name/description columns as Categoricals so later stages compare integer codes"""
+    for col in columns:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+def prefilter_bank(bank_df):
+    """Drop BILLING ACCOUNT rows, negative RBT rebates and zero amounts with one combined mask.
+
+    The name and description tests run once per distinct value rather than once per row.
+    """
+    amount = bank_df['FIN.TRANSACTION AMOUNT'].to_numpy(dtype='float64')
+    is_billing = map_unique(bank_df['ACC.ACCOUNT NAME'], lambda name: name == 'BILLING ACCOUNT')
+    is_rbt = map_unique(bank_df['FIN.TRANSACTION DESCRIPTION'],
+                        lambda desc: isinstance(desc, str) and RBT_PATTERN.search(desc) is not None)
+    keep = (~is_billing.to_numpy(dtype=bool)
+            & ~(is_rbt.to_numpy(dtype=bool) & (amount < 0))  # Negative RBT values only
+            & (np.abs(amount) >= 0.01))
+    return _as_categorical(bank_df.loc[keep], BANK_CATEGORICAL_COLUMNS)
+
+def prefilter_certify(certify_df):
+    """Drop zero amounts from the Certify report"""
+    keep = np.abs(certify_df['USD Amt'].to_numpy(dtype='float64')) >= 0.01
+    return _as_categorical(certify_df.loc[keep], CERTIFY_CATEGORICAL_COLUMNS)
@@ -0,0 +1,480 @@
+"""Reading the input files, the parsed-input cache and writing the output files"""
+import pandas as pd
+import os
+import hashlib
+import importlib.util
+import math
+import time
+import pickle
+import tempfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from .constants import CACHE_DIR, OUTPUT_FORMATS, STREAM_PARTITIONS
+from .core import get_last_name, map_unique, replace_file
+
+# Columns the reconciliation pipeline reads from each input file
+BANK_COLUMNS = ['ACC.ACCOUNT NAME', 'FIN.TRANSACTION AMOUNT', 'FIN.POSTING DATE', 'FIN.TRANSACTION DESCRIPTION']
+CERTIFY_COLUMNS = ['Employee', 'USD Amt', 'Processed Date', 'Vendor', 'Expense Category']
+
+# Explicit type of every pipeline column, applied whichever engine read the file
+COLUMN_TYPES = {
+    'ACC.ACCOUNT NAME': 'text',
+    'FIN.TRANSACTION AMOUNT': 'amount',
+    'FIN.POSTING DATE': 'date',
+    'FIN.TRANSACTION DESCRIPTION': 'text',
+    'Employee': 'text',
+    'USD Amt': 'amount',
+    'Processed Date': 'date',
+    'Vendor': 'text',
+    'Expense Category': 'text'
+}
+
+def apply_column_types(df):
+    """Give the pipeline columns of df their COLUMN_TYPES, in place.
+
+    Amounts become float64 (unparseable values NaN) and names and descriptions text.
+    Dates become datetime64 only when every value parses, so a column holding free
+    text is left as it was read rather than losing it to NaT.
+    """
+    for col in df.columns.intersection(list(COLUMN_TYPES)):
+        kind = COLUMN_TYPES[col]
+        values = df[col]
+        if kind == 'amount':
+            df[col] = pd.to_numeric(values, errors='coerce').astype('float64')
+        elif kind == 'text':
+            df[col] = values.where(values.isna(), values.astype(str))
+        elif not pd.api.types.is_datetime64_any_dtype(values):
+            parsed = pd.to_datetime(values, errors='coerce', format='mixed')
+            if parsed.notna().sum() == values.notna().sum():
+                df[col] = parsed
+    return df
+
+def excel_engine():
+    """Fastest installed Excel reader: calamine if available, otherwise openpyxl"""
+    if importlib.util.find_spec('python_calamine') is not None:
+        return 'calamine'
+    return 'openpyxl'
+
+def _read_excel_columns_openpyxl(file_path, columns):
+    """Stream a worksheet in openpyxl read-only mode, keeping only the requested columns"""
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, ())
+        positions = {}
+        for pos, name in enumerate(header):
+            if name in columns and name not in positions:
+                positions[name] = pos
+        
+        data = {name: [] for name in positions}
+        for row in rows:
+            if not any(cell is not None for cell in row):
+                continue
+            for name, pos in positions.items():
+                data[name].append(row[pos] if pos < len(row) else None)
+    finally:
+        workbook.close()
+    
+    return pd.DataFrame(data)
+
+def load_excel(file_path, columns, preserve_original=True):
+    """Load one input workbook with the fastest available engine.
+
+    With preserve_original the whole sheet is kept for the unmatched output files;
+    otherwise only the given pipeline columns are read.
+    """
+    start = time.perf_counter()
+    engine = excel_engine()
+    
+    if preserve_original:
+        df = pd.read_excel(file_path, engine=engine)
+    elif engine == 'calamine':
+        df = pd.read_excel(file_path, engine=engine, usecols=lambda name: name in columns)
+    else:
+        df = _read_excel_columns_openpyxl(file_path, columns)
+    
+    apply_column_types(df)
+    
+    elapsed = time.perf_counter() - start
+    print(f"Loaded {os.path.basename(file_path)}: {len(df)} rows, {len(df.columns)} columns "
+          f"in {elapsed:.2f}s ({engine})")
+    return df
+
+def load_bank_statement(file_path, preserve_original=True):
+    """Load the bank statement export"""
+    return load_excel(file_path, BANK_COLUMNS, preserve_original)
+
+def load_certify_report(file_path, preserve_original=True):
+    """Load the Certify expense report"""
+    return load_excel(file_path, CERTIFY_COLUMNS, preserve_original)
+
+# Streaming runs split each input into STREAM_PARTITIONS; rows without a posting date share one partition
+UNDATED_PARTITION = 'undated'
+
+def partition_keys(df, partition, name_col, date_col, buckets=16, name_key=get_last_name):
+    """Partition key per row: 'YYYY-MM' of the date, or a stable bucket of the cardholder.
+
+    Cardholders are bucketed by name_key of their name, by default the last name
+    that rows are matched on.
+    """
+    if partition == 'month':
+        dates = pd.to_datetime(df[date_col], errors='coerce')
+        return dates.dt.strftime('%Y-%m').fillna(UNDATED_PARTITION)
+    if partition == 'cardholder':
+        def bucket(name):
+            key = name_key(name) if isinstance(name, str) else ''
+            return f"bucket-{zlib.crc32(key.encode()) % buckets:03d}"
+        return map_unique(df[name_col], bucket)
+    raise ValueError(f"Unknown partition '{partition}', expected one of {', '.join(STREAM_PARTITIONS)}")
+
+def spill_partitions(file_path, columns, name_col, date_col, spill_dir, partition='month',
+                     preserve_original=True, chunk_rows=50000, buckets=16, name_key=get_last_name):
+    """Stream a workbook once in openpyxl read-only mode, spilling its rows to one file per partition.
+
+    At most chunk_rows rows are held in memory. Rows keep their sheet position as index, as
+    pd.read_excel would assign it. Cardholder buckets follow name_key (see partition_keys).
+    Returns ({partition key: spill path}, columns, row count).
+    """
+    from openpyxl import load_workbook
+    
+    start = time.perf_counter()
+    paths = {}
+    prefix = os.path.splitext(os.path.basename(file_path))[0]
+    
+    def flush(rows, first_index, header):
+        chunk = pd.DataFrame(rows, columns=header, index=pd.RangeIndex(first_index, first_index + len(rows)))
+        apply_column_types(chunk)
+        keys = partition_keys(chunk, partition, name_col, date_col, buckets, name_key)
+        for key, part in chunk.groupby(keys, sort=False):
+            path = paths.setdefault(key, os.path.join(spill_dir, f"{prefix}-{key}.pkl"))
+            with open(path, 'ab') as f:
+                pickle.dump(part, f, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    workbook = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        while header and header[-1] is None:
+            header.pop()
+        keep = [pos for pos, name in enumerate(header)
+                if preserve_original or name in columns]
+        header = [header[pos] for pos in keep]
+        
+        buffer = []
+        row_count = 0
+        for row in rows:
+            if not any(cell is not None for cell in row):
+                continue
+            buffer.append([row[pos] if pos < len(row) else None for pos in keep])
+            if len(buffer) == chunk_rows:
+                flush(buffer, row_count, header)
+                row_count += len(buffer)
+                buffer = []
+        if buffer:
+            flush(buffer, row_count, header)
+            row_count += len(buffer)
+    finally:
+        workbook.close()
+    
+    print(f"Spilled {os.path.basename(file_path)}: {row_count} rows into {len(paths)} partitions "
+          f"in {time.perf_counter() - start:.2f}s")
+    return paths, header, row_count
+
+def read_spilled_partition(path, columns):
+    """Concatenate the chunks spilled for one partition; an empty frame if it has none"""
+    if path is None:
+        return pd.DataFrame(columns=columns)
+    parts = []
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                parts.append(pickle.load(f))
+            except EOFError:
+                break
+    return pd.concat(parts) if len(parts) > 1 else parts[0]
+
+# Parsed inputs are cached in CACHE_DIR, keyed by the content hash of the source file
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+CACHE_VERSION = 2
+
+class InputCache:
+    """Disk cache of parsed, type-normalized input frames.
+
+    Entries are stored as Parquet when pyarrow is installed (pickle otherwise) and
+    evicted least-recently-used first once the directory grows past max_bytes.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def file_hash(file_path):
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def key(self, file_path, *options):
+        """Cache key for a file's content plus the loader options that shaped the frame"""
+        file_hash = self.file_hash(file_path)
+        options_hash = hashlib.sha256('|'.join([str(CACHE_VERSION)] + [str(o) for o in options]).encode())
+        return f"{file_hash[:32]}-{options_hash.hexdigest()[:16]}"
+
+    def _entries(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                if name.endswith(('.parquet', '.pkl'))]
+
+    def get(self, key):
+        for path in (os.path.join(self.cache_dir, key + '.parquet'), os.path.join(self.cache_dir, key + '.pkl')):
+            if os.path.exists(path):
+                try:
+                    df = pd.read_parquet(path) if path.endswith('.parquet') else pd.read_pickle(path)
+                except Exception:
+                    if os.path.exists(path):
+                        os.remove(path)
+                    return None
+                try:
+                    os.utime(path)  # mark as recently used
+                except FileNotFoundError:
+                    pass  # evicted by another process meanwhile
+                return df
+        return None
+
+    def put(self, key, df):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # A temporary file of its own, as batch workers may cache the same input at once
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=key + '.', suffix='.tmp')
+        os.close(fd)
+        try:
+            try:
+                df.to_parquet(tmp_path, index=False)
+                path = os.path.join(self.cache_dir, key + '.parquet')
+            except Exception:
+                # pyarrow missing or a column it can't encode
+                df.to_pickle(tmp_path)
+                path = os.path.join(self.cache_dir, key + '.pkl')
+            replace_file(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        sizes = {}
+        for path in self._entries():
+            try:
+                sizes[path] = (os.path.getmtime(path), os.path.getsize(path))
+            except FileNotFoundError:
+                pass  # removed by another process
+        entries = sorted(sizes, key=lambda path: sizes[path][0])
+        total = sum(size for _, size in sizes.values())
+        while entries and total > self.max_bytes:
+            path = entries.pop(0)
+            total -= sizes[path][1]
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def invalidate(self, file_path):
+        """Remove every cached frame parsed from this file's current content"""
+        prefix = self.file_hash(file_path)[:32] + '-'
+        for path in self._entries():
+            if os.path.basename(path).startswith(prefix):
+                os.remove(path)
+
+    def clear(self):
+        for path in self._entries():
+            os.remove(path)
+
+def load_input(loader, file_path, preserve_original=True, cache=None):
+    """Load an input file through the parsed-input cache when one is given"""
+    if cache is None:
+        return loader(file_path, preserve_original)
+    
+    try:
+        key = cache.key(file_path, loader.__name__, preserve_original)
+        df = cache.get(key)
+    except OSError:
+        return loader(file_path, preserve_original)
+    
+    if df is not None:
+        print(f"Loaded {os.path.basename(file_path)} from cache: {len(df)} rows")
+        return df
+    
+    df = loader(file_path, preserve_original)
+    try:
+        cache.put(key, df)
+    except OSError as e:
+        print(f"Could not cache {os.path.basename(file_path)}: {e}")
+    return df
+
+def _cell_columns(df):
+    """Column values as Python objects with missing values replaced by None, ready for xlsxwriter"""
+    columns = []
+    for col in df.columns:
+        values = df[col].astype(object)
+        columns.append(values.where(df[col].notna(), None).tolist())
+    return columns
+
+def _open_excel_writer(path, columns):
+    """xlsxwriter workbook in constant_memory mode with the header row written"""
+    import xlsxwriter
+    
+    workbook = xlsxwriter.Workbook(path, {
+        'constant_memory': True,
+        'remove_timezone': True,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss'
+    })
+    worksheet = workbook.add_worksheet('Sheet1')
+    header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+    worksheet.write_row(0, 0, [str(col) for col in columns], header_format)
+    return workbook, worksheet
+
+# Text written for infinite amounts, as DataFrame.to_excel's inf_rep does (xlsx has no infinity)
+INF_REP = 'inf'
+
+def _write_excel_rows(worksheet, df, first_row):
+    """Write df's rows starting at first_row; returns the next free row"""
+    # constant_memory flushes each row once the next one starts, so rows are written in order
+    for row_num, row in enumerate(zip(*_cell_columns(df)), start=first_row):
+        for col_num, value in enumerate(row):
+            if isinstance(value, float) and math.isinf(value):
+                value = INF_REP if value > 0 else f"-{INF_REP}"
+            if value is not None:
+                worksheet.write(row_num, col_num, value)
+    return first_row + len(df)
+
+def write_excel(df, path):
+    """Write a frame to .xlsx, streaming rows through xlsxwriter's constant_memory mode when installed"""
+    try:
+        workbook, worksheet = _open_excel_writer(path, df.columns)
+    except ImportError:
+        df.to_excel(path, index=False)
+        return
+    
+    try:
+        _write_excel_rows(worksheet, df, 1)
+    finally:
+        workbook.close()
+
+def write_parquet(df, path):
+    df.to_parquet(path, index=False)
+
+def write_csv(df, path):
+    df.to_csv(path, index=False)
+
+OUTPUT_WRITERS = {
+    'xlsx': write_excel,
+    'parquet': write_parquet,
+    'csv': write_csv
+}
+
+def _timed_write(writer, df, path):
+    start = time.perf_counter()
+    writer(df, path)
+    return time.perf_counter() - start, os.path.getsize(path)
+
+def _timed_store(store, matches_df, unmatched_bank_df, unmatched_certify_df, output_dir, output_format):
+    from .store import ReconciliationStore
+    
+    start = time.perf_counter()
+    if isinstance(store, ReconciliationStore):
+        store.add_run(matches_df, unmatched_bank_df, unmatched_certify_df, output_dir, output_format)
+    else:
+        with ReconciliationStore(store) as opened:
+            opened.add_run(matches_df, unmatched_bank_df, unmatched_certify_df, output_dir, output_format)
+    return time.perf_counter() - start, os.path.getsize(getattr(store, 'path', store))
+
+class StreamingTableWriter:
+    """Append-only output table for streaming runs: xlsx through xlsxwriter's constant_memory mode, or csv.
+
+    The columns are fixed by the first appended frame; later frames are aligned to them.
+    """
+
+    def __init__(self, path, output_format):
+        if output_format not in ('xlsx', 'csv'):
+            raise ValueError(f"Streaming output supports xlsx and csv, not '{output_format}'")
+        self.path = path
+        self.output_format = output_format
+        self.columns = None
+        self.rows = 0
+        self._workbook = None
+        self._worksheet = None
+    
+    def append(self, df):
+        if self.columns is None:
+            self.columns = list(df.columns)
+            if self.output_format == 'xlsx':
+                self._workbook, self._worksheet = _open_excel_writer(self.path, self.columns)
+            else:
+                df.iloc[:0].to_csv(self.path, index=False)
+        df = df.reindex(columns=self.columns)
+        if self.output_format == 'xlsx':
+            _write_excel_rows(self._worksheet, df, self.rows + 1)
+        else:
+            df.to_csv(self.path, mode='a', header=False, index=False)
+        self.rows += len(df)
+    
+    def close(self):
+        if self.columns is None:
+            self.append(pd.DataFrame())
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+
+def save_results(matches, unmatched_bank_df, unmatched_certify_df, output_dir="reconciliation_output",
+                 output_format='xlsx', store=None):
+    """Save results with all original columns preserved.
+
+    With store (a ReconciliationStore or the path of its SQLite file), the run is also recorded there.
+    """
+    if output_format not in OUTPUT_WRITERS:
+        raise ValueError(f"Unknown output format '{output_format}', expected one of {', '.join(OUTPUT_FORMATS)}")
+    
+    # Create output directory if it doesn't exist
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    
+    # Save matches
+    matches_df = pd.DataFrame(matches)
+    if not matches_df.empty:
+        matches_df = matches_df.sort_values(['Last Name', 'Group Total', 'Amount'])
+    
+    # Write the three files concurrently; unmatched transactions keep all original columns
+    writer = OUTPUT_WRITERS[output_format]
+    outputs = {
+        f"matched_transactions.{output_format}": matches_df,
+        f"unmatched_bank.{output_format}": unmatched_bank_df,
+        f"unmatched_certify.{output_format}": unmatched_certify_df
+    }
+    with ThreadPoolExecutor(max_workers=len(outputs)) as executor:
+        futures = {
+            filename: executor.submit(_timed_write, writer, df, os.path.join(output_dir, filename))
+            for filename, df in outputs.items()
+        }
+        report = {filename: future.result() for filename, future in futures.items()}
+    
+    if store is not None:
+        report[os.path.basename(getattr(store, 'path', store))] = _timed_store(
+            store, matches_df, unmatched_bank_df, unmatched_certify_df, output_dir, output_format
+        )
+    
+    # Print summary
+    print("\nReconciliation Summary:")
+    print(f"Matched Transactions: {len(matches_df)}")
+    print(f"Unmatched Bank Transactions: {len(unmatched_bank_df)}")
+    print(f"Unmatched Certify Transactions: {len(unmatched_certify_df)}")
+    print("\nFiles saved in:", output_dir)
+    for filename, (elapsed, size) in report.items():
+        print(f"  {filename}: {size:,} bytes in {elapsed:.2f}s")
+    
+    return report
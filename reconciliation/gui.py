@@ -0,0 +1,321 @@
+"""Tk front end; imported only when the program starts without arguments"""
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from datetime import datetime
+
+from .constants import available_output_formats
+from .monitor import PipelineMonitor, ReconciliationCancelled
+
+# Status text shown in the GUI for each pipeline stage
+STAGE_LABELS = {
+    'load': "Loading input files",
+    'zero_sum': "Removing zero-sum groups",
+    'exact_match': "Matching exact amounts",
+    'combo_match': "Matching split transactions",
+    'write': "Writing output files"
+}
+
+class ModernReconciliationGUI:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Certify Reconciliation Tool")
+        self.root.geometry("800x600")
+        
+        # Configure colors
+        self.BLUE = "#184287"
+        self.COPPER = "#cd916d"
+        self.BG_COLOR = "#ffffff"
+        self.HOVER_COPPER = "#d9a68c"
+        
+        # File paths
+        self.bank_file_path = tk.StringVar()
+        self.certify_file_path = tk.StringVar()
+        self.selected_year = tk.StringVar()
+        self.selected_month = tk.StringVar()
+        self.output_format = tk.StringVar(value='xlsx')
+        self.keep_all_columns = tk.BooleanVar(value=True)
+        
+        # Background reconciliation state
+        self.monitor = None
+        self.progress_queue = queue.Queue()
+        
+        # Configure styles
+        self.setup_styles()
+        self.create_gui()
+        
+    def setup_styles(self):
+        # Configure custom styles
+        style = ttk.Style()
+        
+        # Set default font to Arial
+        self.root.option_add("*Font", "Arial 10")
+        
+        # Configure frame style
+        style.configure("Modern.TFrame", background=self.BG_COLOR)
+        
+        # Configure label styles
+        style.configure("Title.TLabel", 
+                       font=('Arial', 24, 'bold'), 
+                       foreground=self.BLUE,
+                       background=self.BG_COLOR)
+        
+        style.configure("Subtitle.TLabel", 
+                       font=('Arial', 14, 'bold'),
+                       foreground=self.BLUE,
+                       background=self.BG_COLOR)
+        
+        style.configure("Modern.TLabel",
+                       font=('Arial', 10),
+                       foreground=self.BLUE,
+                       background=self.BG_COLOR)
+        
+        # Configure button styles
+        style.configure("Modern.TButton",
+                       font=("Arial", 10),
+                       foreground=self.BLUE,
+                       background=self.COPPER,
+                       padding=(10, 5))
+        
+        style.map("Modern.TButton",
+                 foreground=[('active', self.BLUE)],
+                 background=[('active', self.HOVER_COPPER)])
+        
+        # Configure entry style
+        style.configure("Modern.TEntry",
+                       fieldbackground="white",
+                       foreground=self.BLUE,
+                       padding=(5, 5))
+        
+        # Configure combobox style
+        style.configure("Modern.TCombobox",
+                       fieldbackground="white",
+                       foreground=self.BLUE,
+                       padding=(5, 5))
+        
+        # Configure checkbutton style
+        style.configure("Modern.TCheckbutton",
+                       font=('Arial', 10),
+                       foreground=self.BLUE,
+                       background=self.BG_COLOR)
+        
+    def create_gui(self):
+        # Main container
+        main_frame = ttk.Frame(self.root, style="Modern.TFrame", padding="20")
+        main_frame.grid(row=0, column=0, sticky="nsew")
+        
+        # Configure grid weight
+        self.root.grid_rowconfigure(0, weight=1)
+        self.root.grid_columnconfigure(0, weight=1)
+        
+        # Title
+        title_label = ttk.Label(main_frame, 
+                              text="Certify Reconciliation Tool",
+                              style="Title.TLabel")
+        title_label.grid(row=0, column=0, columnspan=3, pady=(0, 30), sticky="w")
+        
+        # File Selection Section
+        file_section = ttk.Frame(main_frame, style="Modern.TFrame")
+        file_section.grid(row=1, column=0, columnspan=3, sticky="ew", pady=(0, 20))
+        
+        ttk.Label(file_section, 
+                 text="File Selection",
+                 style="Subtitle.TLabel").grid(row=0, column=0, columnspan=3, pady=(0, 15), sticky="w")
+        
+        # Bank File
+        ttk.Label(file_section, 
+                 text="Bank Statement:",
+                 style="Modern.TLabel").grid(row=1, column=0, sticky="w")
+        ttk.Entry(file_section,
+                 textvariable=self.bank_file_path,
+                 style="Modern.TEntry",
+                 width=50).grid(row=1, column=1, padx=10)
+        ttk.Button(file_section,
+                  text="Browse",
+                  style="Modern.TButton",
+                  command=lambda: self.browse_file('bank')).grid(row=1, column=2)
+        
+        # Certify File
+        ttk.Label(file_section,
+                 text="Certify Report:",
+                 style="Modern.TLabel").grid(row=2, column=0, sticky="w", pady=(15, 0))
+        ttk.Entry(file_section,
+                 textvariable=self.certify_file_path,
+                 style="Modern.TEntry",
+                 width=50).grid(row=2, column=1, padx=10, pady=(15, 0))
+        ttk.Button(file_section,
+                  text="Browse",
+                  style="Modern.TButton",
+                  command=lambda: self.browse_file('certify')).grid(row=2, column=2, pady=(15, 0))
+        
+        # Date Selection Section
+        date_section = ttk.Frame(main_frame, style="Modern.TFrame")
+        date_section.grid(row=2, column=0, columnspan=3, sticky="ew", pady=20)
+        
+        ttk.Label(date_section,
+                 text="Output File Naming",
+                 style="Subtitle.TLabel").grid(row=0, column=0, columnspan=3, pady=(0, 15), sticky="w")
+        
+        # Year Selection
+        ttk.Label(date_section,
+                 text="Year:",
+                 style="Modern.TLabel").grid(row=1, column=0, sticky="w")
+        years = [str(year) for year in range(2020, datetime.now().year + 2)]
+        year_combo = ttk.Combobox(date_section,
+                                 textvariable=self.selected_year,
+                                 values=years,
+                                 style="Modern.TCombobox",
+                                 width=15)
+        year_combo.grid(row=1, column=1, sticky="w", padx=(10, 0))
+        year_combo.set(str(datetime.now().year))
+        
+        # Month Selection
+        ttk.Label(date_section,
+                 text="Month:",
+                 style="Modern.TLabel").grid(row=2, column=0, sticky="w", pady=(15, 0))
+        months = ['01', '02', '03', '04', '05', '06', '07', '08', '09', '10', '11', '12']
+        month_combo = ttk.Combobox(date_section,
+                                  textvariable=self.selected_month,
+                                  values=months,
+                                  style="Modern.TCombobox",
+                                  width=15)
+        month_combo.grid(row=2, column=1, sticky="w", padx=(10, 0), pady=(15, 0))
+        month_combo.set(datetime.now().strftime('%m'))
+        
+        # Output Format Selection
+        ttk.Label(date_section,
+                 text="Output Format:",
+                 style="Modern.TLabel").grid(row=3, column=0, sticky="w", pady=(15, 0))
+        format_combo = ttk.Combobox(date_section,
+                                   textvariable=self.output_format,
+                                   values=list(available_output_formats()),
+                                   state="readonly",
+                                   style="Modern.TCombobox",
+                                   width=15)
+        format_combo.grid(row=3, column=1, sticky="w", padx=(10, 0), pady=(15, 0))
+        
+        # Column Loading; unticked loads only the columns reconciliation needs, which is faster on wide sheets
+        ttk.Checkbutton(date_section,
+                        text="Keep all original columns in unmatched files",
+                        variable=self.keep_all_columns,
+                        style="Modern.TCheckbutton").grid(row=4, column=0, columnspan=2, sticky="w", pady=(15, 0))
+        
+        # Process and Cancel Buttons
+        button_section = ttk.Frame(main_frame, style="Modern.TFrame")
+        button_section.grid(row=3, column=0, columnspan=3, pady=30)
+        
+        self.process_button = ttk.Button(button_section,
+                                       text="Process Reconciliation",
+                                       style="Modern.TButton",
+                                       command=self.process_reconciliation)
+        self.process_button.grid(row=0, column=0, padx=(0, 10))
+        
+        self.cancel_button = ttk.Button(button_section,
+                                      text="Cancel",
+                                      style="Modern.TButton",
+                                      state="disabled",
+                                      command=self.cancel_reconciliation)
+        self.cancel_button.grid(row=0, column=1)
+        
+        # Status Label
+        self.status_label = ttk.Label(main_frame,
+                                    text="",
+                                    style="Modern.TLabel")
+        self.status_label.grid(row=4, column=0, columnspan=3, pady=10)
+
+    def browse_file(self, file_type):
+        filename = filedialog.askopenfilename(
+            title=f"Select {file_type.capitalize()} File",
+            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
+        )
+        if filename:
+            if file_type == 'bank':
+                self.bank_file_path.set(filename)
+            else:
+                self.certify_file_path.set(filename)
+    
+    def process_reconciliation(self):
+        if not self.bank_file_path.get() or not self.certify_file_path.get():
+            messagebox.showerror("Error", "Please select both bank and certify files.")
+            return
+            
+        if not self.selected_year.get() or not self.selected_month.get():
+            messagebox.showerror("Error", "Please select both year and month.")
+            return
+            
+        # Create output directory with year and month
+        output_dir = f"reconciliation_{self.selected_year.get()}_{self.selected_month.get()}"
+        
+        # Run the pipeline on a worker thread; it reports back through progress_queue
+        self.monitor = PipelineMonitor(
+            progress=lambda stage, message: self.progress_queue.put(('progress', stage, message))
+        )
+        worker = threading.Thread(
+            target=self.run_reconciliation,
+            args=(self.monitor, self.bank_file_path.get(), self.certify_file_path.get(),
+                  output_dir, self.output_format.get(), self.keep_all_columns.get()),
+            daemon=True
+        )
+        
+        self.process_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        self.status_label.config(text="Processing... Please wait.")
+        worker.start()
+        self.root.after(100, self.poll_progress)
+    
+    def run_reconciliation(self, monitor, bank_file, certify_file, output_dir, output_format, preserve_original=True):
+        """Worker thread body; never touches Tk widgets directly"""
+        try:
+            # pandas loads here, off the Tk thread, so the window opens without waiting for it
+            from .files import save_results
+            from .pipeline import reconcile_statements
+            matches, unmatched_bank, unmatched_certify = reconcile_statements(
+                bank_file,
+                certify_file,
+                preserve_original=preserve_original,
+                monitor=monitor
+            )
+            
+            monitor.report('write', f"Saving {output_format} files")
+            save_results(matches, unmatched_bank, unmatched_certify, output_dir, output_format)
+            self.progress_queue.put(('done', output_dir))
+        except ReconciliationCancelled:
+            self.progress_queue.put(('cancelled',))
+        except Exception as e:
+            self.progress_queue.put(('error', str(e)))
+    
+    def poll_progress(self):
+        """Apply queued worker messages to the UI, rescheduling itself until the worker finishes"""
+        while True:
+            try:
+                message = self.progress_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            kind = message[0]
+            if kind == 'progress':
+                _, stage, detail = message
+                text = STAGE_LABELS.get(stage, stage)
+                self.status_label.config(text=f"{text}... {detail}" if detail else f"{text}...")
+                continue
+            
+            self.process_button.config(state="normal")
+            self.cancel_button.config(state="disabled")
+            if kind == 'done':
+                self.status_label.config(text="✓ Reconciliation completed successfully!")
+                messagebox.showinfo("Success", f"Reconciliation completed! Files saved in {message[1]}")
+            elif kind == 'cancelled':
+                self.status_label.config(text="Reconciliation cancelled.")
+            else:
+                self.status_label.config(text="✗ Error occurred during processing!")
+                messagebox.showerror("Error", f"An error occurred: {message[1]}")
+            return
+        
+        self.root.after(100, self.poll_progress)
+    
+    def cancel_reconciliation(self):
+        if self.monitor is not None:
+            self.monitor.cancel()
+            self.cancel_button.config(state="disabled")
+            self.status_label.config(text="Cancelling...")
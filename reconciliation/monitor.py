@@ -0,0 +1,102 @@
+"""Progress, cancellation and profiling for a running reconciliation; loads pandas only to save a profile"""
+import os
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+class ReconciliationCancelled(Exception):
+    """Raised inside the pipeline when the user cancels a running reconciliation"""
+
+class PipelineProfile:
+    """Wall time, row counts and combinations evaluated per pipeline stage and per cardholder"""
+
+    def __init__(self):
+        self.stages = []
+        self.cardholders = []
+        self.counters = {}
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        """Time a stage; the caller may fill in rows_out and combinations on the yielded record"""
+        record = {'stage': name, 'seconds': 0.0, 'rows_in': rows_in, 'rows_out': None, 'combinations': 0}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = round(time.perf_counter() - start, 6)
+            self.stages.append(record)
+
+    def add_cardholder(self, last_name, bank_rows, certify_rows, seconds, combinations, matched_groups):
+        self.cardholders.append({
+            'last_name': last_name,
+            'bank_rows': bank_rows,
+            'certify_rows': certify_rows,
+            'seconds': round(seconds, 6),
+            'combinations': combinations,
+            'matched_groups': matched_groups
+        })
+
+    def heaviest_cardholders(self, count=10):
+        return sorted(self.cardholders, key=lambda c: (c['combinations'], c['seconds']), reverse=True)[:count]
+
+    def print_summary(self, count=5):
+        print("\nPipeline profile:")
+        for record in self.stages:
+            rows = f"{record['rows_in'] if record['rows_in'] is not None else '-'} -> " \
+                   f"{record['rows_out'] if record['rows_out'] is not None else '-'} rows"
+            print(f"  {record['stage']:<20} {record['seconds']:>9.3f}s  {rows:<22} "
+                  f"{record['combinations']:,} combinations")
+        heaviest = self.heaviest_cardholders(count)
+        if heaviest:
+            print("Heaviest cardholders:")
+            for c in heaviest:
+                print(f"  {c['last_name']:<20} {c['seconds']:>9.3f}s  {c['combinations']:,} combinations "
+                      f"({c['bank_rows']} bank / {c['certify_rows']} certify open rows)")
+
+    def save(self, output_dir):
+        """Write profile.json and profile_cardholders.csv into output_dir"""
+        os.makedirs(output_dir, exist_ok=True)
+        json_path = os.path.join(output_dir, "profile.json")
+        with open(json_path, 'w') as f:
+            json.dump({
+                'stages': self.stages,
+                'heaviest_cardholders': self.heaviest_cardholders(),
+                'cardholders': self.cardholders,
+                'counters': self.counters
+            }, f, indent=2, default=str)
+        csv_path = os.path.join(output_dir, "profile_cardholders.csv")
+        import pandas as pd
+        pd.DataFrame(self.cardholders, columns=['last_name', 'bank_rows', 'certify_rows', 'seconds',
+                                                'combinations', 'matched_groups']).to_csv(csv_path, index=False)
+        return json_path, csv_path
+
+class PipelineMonitor:
+    """Carries stage progress out of, and a cancellation request into, a running reconciliation.
+
+    progress is called as progress(stage, message) from the thread running the pipeline;
+    stage timings and counters are collected on profile.
+    """
+
+    STAGES = ('load', 'zero_sum', 'exact_match', 'combo_match', 'write')
+
+    def __init__(self, progress=None, profile=None):
+        self.progress = progress
+        self.profile = profile or PipelineProfile()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise ReconciliationCancelled("Reconciliation cancelled")
+
+    def report(self, stage, message=''):
+        self.check_cancelled()
+        if self.progress is not None:
+            self.progress(stage, message)
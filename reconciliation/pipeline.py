@@ -0,0 +1,608 @@
+"""Whole-run pipelines: single, incremental, streaming and batch reconciliation"""
+import pandas as pd
+import numpy as np
+import os
+import io
+import re
+import glob
+import time
+import pickle
+import tempfile
+from contextlib import redirect_stdout
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .constants import MATCH_ENGINES, OPTIMAL_TIME_BUDGET, OUTPUT_FORMATS
+from .core import (COMBINATION_MEMO, DERIVED_COLUMNS, NameResolver, find_matching_groups, get_last_name,
+                   prefilter_bank, prefilter_certify, remove_zero_sum_groups, to_cents_array, to_date_ordinals)
+from .files import (BANK_COLUMNS, CERTIFY_COLUMNS, UNDATED_PARTITION, InputCache, StreamingTableWriter,
+                    apply_column_types, load_bank_statement, load_certify_report, load_input, read_spilled_partition,
+                    save_results, spill_partitions)
+from .monitor import PipelineMonitor
+
+def reconcile_statements(bank_file_path, certify_file_path, preserve_original=True, use_cache=True, workers=1,
+                         monitor=None, date_window_days=None, name_resolver=None, engine='greedy',
+                         time_budget=OPTIMAL_TIME_BUDGET):
+    """Reconciliation that preserves all original data"""
+    monitor = monitor or PipelineMonitor()
+    profile = monitor.profile
+    
+    # Read original files (re-runs on unchanged files come from the parsed-input cache)
+    monitor.report('load', "Reading input files")
+    with profile.stage('load') as record:
+        cache = InputCache() if use_cache else None
+        bank_df = load_input(load_bank_statement, bank_file_path, preserve_original, cache)
+        certify_df = load_input(load_certify_report, certify_file_path, preserve_original, cache)
+        record['rows_out'] = len(bank_df) + len(certify_df)
+    
+    return reconcile_frames(bank_df, certify_df, workers, monitor, date_window_days, name_resolver, engine, time_budget)
+
+def _column_values(series, positions):
+    """Values of series at row positions, as a plain array (categorical columns come back as their values)"""
+    return series.to_numpy()[positions]
+
+def build_match_table(matched_groups, bank_df, certify_df):
+    """Matches DataFrame for matched_groups, plus the bank and certify index labels the kept groups cover.
+
+    Group membership is exploded into flat (group, bank row, certify row) position arrays and
+    each output column is gathered with a single take. Groups whose bank rows sum to zero are
+    skipped. Within a group the i-th bank row pairs with the i-th certify row; rows beyond the
+    shorter side count as matched but get no match record. The index holds the group number.
+    """
+    group_count = len(matched_groups)
+    bank_sizes = np.fromiter((len(g['bank_indices']) for g in matched_groups), dtype=np.int64, count=group_count)
+    certify_sizes = np.fromiter((len(g['certify_indices']) for g in matched_groups), dtype=np.int64,
+                                count=group_count)
+    bank_pos = bank_df.index.get_indexer(list(chain.from_iterable(g['bank_indices'] for g in matched_groups)))
+    certify_pos = certify_df.index.get_indexer(
+        list(chain.from_iterable(g['certify_indices'] for g in matched_groups))
+    )
+    
+    # Skip groups whose transactions sum to zero
+    amounts = np.nan_to_num(bank_df['FIN.TRANSACTION AMOUNT'].to_numpy(dtype='float64')[bank_pos])
+    bank_sums = np.round(np.bincount(np.repeat(np.arange(group_count), bank_sizes), weights=amounts,
+                                     minlength=group_count), 2)
+    keep = np.abs(bank_sums) > 0.01
+    for bank_sum in bank_sums[~keep]:
+        print(f"Skipping zero-sum group with bank total: {bank_sum}")
+    
+    # One record per (bank, certify) pair, only for the minimum number of transactions per group
+    pair_counts = np.where(keep, np.minimum(bank_sizes, certify_sizes), 0)
+    pair_group = np.repeat(np.arange(group_count), pair_counts)
+    pair_rank = np.arange(len(pair_group)) - np.repeat(np.cumsum(pair_counts) - pair_counts, pair_counts)
+    pair_bank = bank_pos[(np.cumsum(bank_sizes) - bank_sizes)[pair_group] + pair_rank]
+    pair_certify = certify_pos[(np.cumsum(certify_sizes) - certify_sizes)[pair_group] + pair_rank]
+    
+    last_names = np.array([g['last_name'] for g in matched_groups], dtype=object)
+    matches = pd.DataFrame({
+        'Last Name': last_names[pair_group],
+        'Amount': _column_values(certify_df['AMOUNT'], pair_certify),  # Use individual transaction amount
+        'Bank Date': _column_values(bank_df['FIN.POSTING DATE'], pair_bank),
+        'Certify Date': _column_values(certify_df['Processed Date'], pair_certify),
+        'Bank Description': _column_values(bank_df['FIN.TRANSACTION DESCRIPTION'], pair_bank),
+        'Certify Description': _column_values(certify_df['Vendor'], pair_certify),
+        'Expense Category': _column_values(certify_df['Expense Category'], pair_certify),
+        'Group Total': np.abs(bank_sums)[pair_group]  # Store total separately
+    }, index=pd.Index(pair_group, name='group_id'))
+    
+    matched_bank_indices = bank_df.index[bank_pos[np.repeat(keep, bank_sizes)]].unique()
+    matched_certify_indices = certify_df.index[certify_pos[np.repeat(keep, certify_sizes)]].unique()
+    return matches, matched_bank_indices, matched_certify_indices
+
+def reconcile_frames(bank_df, certify_df, workers=1, monitor=None, date_window_days=None, name_resolver=None,
+                     engine='greedy', time_budget=OPTIMAL_TIME_BUDGET):
+    """Reconcile bank and Certify frames that are already loaded.
+
+    Shared by whole-file and streaming runs; returns (matches, unmatched_bank, unmatched_certify),
+    matches being the DataFrame built by build_match_table.
+    date_window_days optionally limits split matches to transactions dated close together;
+    name_resolver optionally groups cardholders by resolved name instead of bare last name;
+    engine and time_budget select the matching engine (see find_matching_groups).
+    """
+    monitor = monitor or PipelineMonitor()
+    profile = monitor.profile
+    memo_before = COMBINATION_MEMO.counts()
+    
+    with profile.stage('prefilter', rows_in=len(bank_df) + len(certify_df)) as record:
+        bank_df = prefilter_bank(bank_df)
+        certify_df = prefilter_certify(certify_df)
+        record['rows_out'] = len(bank_df) + len(certify_df)
+    
+    # Remove zero-sum groups from both datasets
+    print("\nChecking for zero-sum transaction groups...")
+    monitor.report('zero_sum', "Checking input transactions")
+    with profile.stage('zero_sum', rows_in=len(bank_df) + len(certify_df)) as record:
+        bank_df = remove_zero_sum_groups(
+            bank_df,
+            name_col='ACC.ACCOUNT NAME',
+            amount_col='FIN.TRANSACTION AMOUNT',
+            desc_col='FIN.TRANSACTION DESCRIPTION',
+            date_col='FIN.POSTING DATE',
+            monitor=monitor
+        )
+    
+        certify_df = remove_zero_sum_groups(
+            certify_df,
+            name_col='Employee',
+            amount_col='USD Amt',
+            desc_col='Vendor',
+            date_col='Processed Date',
+            monitor=monitor
+        )
+        record['rows_out'] = len(bank_df) + len(certify_df)
+        record['combinations'] = (bank_df.attrs['zero_sum_combinations']
+                                  + certify_df.attrs['zero_sum_combinations'])
+    
+    print("\nStarting reconciliation process...")
+    print(f"Total bank transactions: {len(bank_df)}")
+    print(f"Total certify transactions: {len(certify_df)}")
+    
+    # Find matching groups
+    matched_groups = find_matching_groups(bank_df, certify_df, workers, monitor, date_window_days, name_resolver,
+                                          engine, time_budget)
+    
+    with profile.stage('build_matches', rows_in=len(matched_groups)) as record:
+        matches, matched_bank_indices, matched_certify_indices = build_match_table(matched_groups, bank_df,
+                                                                                   certify_df)
+        
+        # Get unmatched entries using indices
+        unmatched_bank = bank_df.loc[~bank_df.index.isin(matched_bank_indices)]
+        unmatched_certify = certify_df.loc[~certify_df.index.isin(matched_certify_indices)]
+        record['rows_out'] = len(matches)
+    
+    # Remove zero-sum groups from unmatched entries
+    print("\nChecking for zero-sum groups in unmatched entries...")
+    monitor.report('zero_sum', "Checking unmatched transactions")
+    
+    with profile.stage('zero_sum_unmatched', rows_in=len(unmatched_bank) + len(unmatched_certify)) as record:
+        if not unmatched_bank.empty:
+            original_unmatched_bank = len(unmatched_bank)
+            unmatched_bank = remove_zero_sum_groups(
+                unmatched_bank,
+                name_col='ACC.ACCOUNT NAME',
+                amount_col='FIN.TRANSACTION AMOUNT',
+                desc_col='FIN.TRANSACTION DESCRIPTION',
+                date_col='FIN.POSTING DATE',
+                monitor=monitor
+            )
+            removed_bank = original_unmatched_bank - len(unmatched_bank)
+            if removed_bank > 0:
+                print(f"Removed {removed_bank} bank transactions that formed zero-sum groups")
+    
+        if not unmatched_certify.empty:
+            original_unmatched_certify = len(unmatched_certify)
+            unmatched_certify = remove_zero_sum_groups(
+                unmatched_certify,
+                name_col='Employee',
+                amount_col='USD Amt',
+                desc_col='Vendor',
+                date_col='Processed Date',
+                monitor=monitor
+            )
+            removed_certify = original_unmatched_certify - len(unmatched_certify)
+            if removed_certify > 0:
+                print(f"Removed {removed_certify} certify transactions that formed zero-sum groups")
+        record['rows_out'] = len(unmatched_bank) + len(unmatched_certify)
+        record['combinations'] = (unmatched_bank.attrs.get('zero_sum_combinations', 0)
+                                  + unmatched_certify.attrs.get('zero_sum_combinations', 0))
+    
+    print(f"\nFound {len(matched_groups)} matching groups")
+    print(f"Matched bank transactions: {len(matched_bank_indices)}")
+    print(f"Matched certify transactions: {len(matched_certify_indices)}")
+    print(f"Final unmatched bank transactions: {len(unmatched_bank)}")
+    print(f"Final unmatched certify transactions: {len(unmatched_certify)}")
+    
+    memo = COMBINATION_MEMO.counts()
+    memo_counts = {'hits': memo['hits'] - memo_before['hits'], 'misses': memo['misses'] - memo_before['misses']}
+    profile.counters['combination_memo'] = memo_counts
+    print(f"Combination memo: {memo_counts['hits']} hits, {memo_counts['misses']} misses "
+          f"({memo['entries']} cached searches)")
+    
+    return matches, unmatched_bank, unmatched_certify
+
+# Incremental runs keep the fingerprints of settled rows and the unmatched residue between runs
+STATE_VERSION = 1
+
+def row_fingerprints(df, columns, amount_col, date_col):
+    """Stable identity for each row: a hash of its pipeline columns plus an occurrence counter.
+
+    Amounts are compared in cents and dates as timestamps, so a row read back from a
+    csv or xlsx output hashes like the original. The counter keeps repeated identical
+    charges distinct.
+    """
+    key = pd.DataFrame(index=df.index)
+    for col in columns:
+        if col not in df.columns:
+            continue
+        if col == amount_col:
+            key[col] = to_cents_array(df[col])
+        elif col == date_col:
+            key[col] = to_date_ordinals(df[col])
+        else:
+            key[col] = df[col].astype(object).where(df[col].notna(), '').astype(str).str.strip()
+    hashes = pd.Series(pd.util.hash_pandas_object(key, index=False).to_numpy(), index=df.index)
+    occurrence = hashes.groupby(hashes, sort=False).cumcount()
+    return pd.Series([f"{h:016x}-{n}" for h, n in zip(hashes.tolist(), occurrence.tolist())],
+                     index=df.index, dtype=object)
+
+def new_state():
+    return {
+        'version': STATE_VERSION,
+        'settled_bank': set(),
+        'settled_certify': set(),
+        'residue_bank': None,
+        'residue_certify': None
+    }
+
+def load_state(path):
+    """Incremental state saved by a previous run, or a fresh state if path does not exist"""
+    if not path or not os.path.exists(path):
+        return new_state()
+    with open(path, 'rb') as f:
+        state = pickle.load(f)
+    if state.get('version') != STATE_VERSION:
+        raise ValueError(f"State file {path} has version {state.get('version')}, expected {STATE_VERSION}")
+    return state
+
+def save_state(path, state):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+def load_previous_unmatched(output_dir, name):
+    """A previous run's unmatched_<name> output in whichever format it was saved, without derived columns.
+
+    output_dir may also be a reconciliation store file, whose latest run is carried forward.
+    The pipeline columns are typed as when loading an input file, as csv and the store keep
+    dates as text.
+    """
+    if os.path.isfile(output_dir):
+        from .store import ReconciliationStore
+        with ReconciliationStore(output_dir) as store:
+            return apply_column_types(store.unmatched(name))
+    readers = {'xlsx': pd.read_excel, 'parquet': pd.read_parquet, 'csv': pd.read_csv}
+    for output_format in OUTPUT_FORMATS:
+        path = os.path.join(output_dir, f"unmatched_{name}.{output_format}")
+        if os.path.exists(path):
+            df = readers[output_format](path)
+            return apply_column_types(df.drop(columns=[col for col in DERIVED_COLUMNS if col in df.columns]))
+    raise FileNotFoundError(f"No unmatched_{name} output in {output_dir}")
+
+def _incremental_input(df, residue, settled, columns, amount_col, date_col):
+    """Residue plus the rows of df not seen before, on a fresh index, with their fingerprints"""
+    fingerprints = row_fingerprints(df, columns, amount_col, date_col)
+    if residue is None or residue.empty:
+        # An empty residue read back from an output has object columns that would leak into the concat
+        residue = df.iloc[:0]
+    is_new = ~fingerprints.isin(settled) & ~fingerprints.isin(residue.index)
+    
+    combined = pd.concat([residue, df[is_new]], ignore_index=True)
+    combined_fingerprints = pd.Series(list(residue.index) + fingerprints[is_new].tolist(),
+                                      index=combined.index, dtype=object)
+    return combined, combined_fingerprints, int(is_new.sum()), len(residue)
+
+def reconcile_incremental(bank_file_path, certify_file_path, state_path=None, previous_output_dir=None,
+                          preserve_original=True, use_cache=True, workers=1, monitor=None, date_window_days=None,
+                          name_resolver=None, engine='greedy', time_budget=OPTIMAL_TIME_BUDGET):
+    """Reconcile only new activity plus the residue left unmatched by earlier runs.
+
+    With state_path, rows settled by earlier runs (matched or removed as zero-sum) are
+    recognised by fingerprint and skipped, so the input files may hold the whole history;
+    the updated state is written back after the run. With previous_output_dir, that run's
+    unmatched outputs are carried in as residue and the input files should hold only new
+    activity. Returns (matches, unmatched_bank, unmatched_certify) like reconcile_statements.
+    """
+    monitor = monitor or PipelineMonitor()
+    state = load_state(state_path)
+    residue_bank = state['residue_bank']
+    residue_certify = state['residue_certify']
+    if previous_output_dir:
+        residue_bank = load_previous_unmatched(previous_output_dir, 'bank')
+        residue_certify = load_previous_unmatched(previous_output_dir, 'certify')
+        residue_bank.index = row_fingerprints(residue_bank, BANK_COLUMNS, 'FIN.TRANSACTION AMOUNT',
+                                              'FIN.POSTING DATE')
+        residue_certify.index = row_fingerprints(residue_certify, CERTIFY_COLUMNS, 'USD Amt', 'Processed Date')
+    
+    monitor.report('load', "Reading input files")
+    with monitor.profile.stage('load') as record:
+        cache = InputCache() if use_cache else None
+        bank_df = load_input(load_bank_statement, bank_file_path, preserve_original, cache)
+        certify_df = load_input(load_certify_report, certify_file_path, preserve_original, cache)
+        
+        bank_df, bank_fingerprints, new_bank, carried_bank = _incremental_input(
+            bank_df, residue_bank, state['settled_bank'], BANK_COLUMNS, 'FIN.TRANSACTION AMOUNT', 'FIN.POSTING DATE'
+        )
+        certify_df, certify_fingerprints, new_certify, carried_certify = _incremental_input(
+            certify_df, residue_certify, state['settled_certify'], CERTIFY_COLUMNS, 'USD Amt', 'Processed Date'
+        )
+        record['rows_out'] = len(bank_df) + len(certify_df)
+    
+    print(f"\nIncremental run: {new_bank} new + {carried_bank} carried bank rows, "
+          f"{new_certify} new + {carried_certify} carried certify rows")
+    
+    matches, unmatched_bank, unmatched_certify = reconcile_frames(bank_df, certify_df, workers, monitor,
+                                                                  date_window_days, name_resolver, engine,
+                                                                  time_budget)
+    
+    # Everything that was not left unmatched is settled; the unmatched rows become the next residue
+    for side, fingerprints, unmatched in (('bank', bank_fingerprints, unmatched_bank),
+                                          ('certify', certify_fingerprints, unmatched_certify)):
+        open_rows = fingerprints.index.isin(unmatched.index)
+        state[f'settled_{side}'].update(fingerprints[~open_rows])
+        residue = unmatched.drop(columns=[col for col in DERIVED_COLUMNS if col in unmatched.columns])
+        residue.index = pd.Index(fingerprints.loc[unmatched.index], dtype=object)
+        state[f'residue_{side}'] = residue
+    
+    if state_path:
+        save_state(state_path, state)
+        print(f"Saved incremental state to {state_path}")
+    
+    return matches, unmatched_bank, unmatched_certify
+
+def _month_number(dates):
+    """Months since year 0 for each date; NaN where the date is missing"""
+    dates = pd.to_datetime(dates, errors='coerce')
+    return dates.dt.year * 12 + dates.dt.month - 1
+
+def _with_residue(residue, df):
+    """Prepend carried rows to a partition, keeping column dtypes when either side is empty"""
+    frames = [frame for frame in (residue, df) if len(frame)]
+    if len(frames) == 2:
+        return pd.concat(frames)
+    return frames[0] if frames else df
+
+class _PresolvedNames:
+    """Stands in for a NameResolver on streamed cardholder partitions.
+
+    Every name was resolved against the whole files while partitioning. Resolving again
+    against one partition's cardholders could settle a name that is ambiguous across the
+    files, so resolve() only looks the keys up.
+    """
+    
+    def __init__(self, resolver):
+        self.mapping = resolver.mapping
+    
+    def resolve(self, bank_names, certify_names):
+        return (bank_names.astype(object).map(self.mapping['bank']).fillna(''),
+                certify_names.astype(object).map(self.mapping['certify']).fillna(''))
+
+def _collecting(name_key, names):
+    """name_key that also adds each name it is given to the names set"""
+    def collect(name):
+        names.add(name)
+        return name_key(name)
+    return collect
+
+def reconcile_streaming(bank_file_path, certify_file_path, output_dir="reconciliation_output", partition='month',
+                        carry_months=1, output_format='xlsx', preserve_original=True, workers=1, monitor=None,
+                        chunk_rows=50000, buckets=16, date_window_days=None, name_resolver=None, engine='greedy',
+                        time_budget=OPTIMAL_TIME_BUDGET):
+    """Reconcile one partition at a time so memory stays bounded for long statement periods.
+
+    Both files are streamed once into per-partition spill files. Partitions are then
+    reconciled in order and results are appended to the output files as they are found.
+    With partition='month', unmatched rows are carried into the next carry_months
+    windows (Certify often lags the bank posting) before being written as unmatched.
+    Cardholder partitions are independent, so nothing is carried; with a name_resolver
+    they bucket by resolved cardholder, so every name is resolved against the whole files
+    while partitioning. Matched rows are ordered per partition rather than across the whole file.
+    """
+    monitor = monitor or PipelineMonitor()
+    os.makedirs(output_dir, exist_ok=True)
+    writers = {
+        'matches': StreamingTableWriter(os.path.join(output_dir, f"matched_transactions.{output_format}"),
+                                        output_format),
+        'bank': StreamingTableWriter(os.path.join(output_dir, f"unmatched_bank.{output_format}"), output_format),
+        'certify': StreamingTableWriter(os.path.join(output_dir, f"unmatched_certify.{output_format}"),
+                                        output_format)
+    }
+    
+    with tempfile.TemporaryDirectory(prefix='reconciliation-spill-') as spill_dir:
+        monitor.report('load', "Partitioning input files")
+        with monitor.profile.stage('load') as record:
+            # Resolved cardholders may not share a last name, so bucket them by resolved key
+            resolve_names = partition == 'cardholder' and name_resolver is not None
+            bank_names = set()
+            bank_key = _collecting(name_resolver.bank_key, bank_names) if resolve_names else get_last_name
+            bank_paths, bank_columns, bank_rows = spill_partitions(
+                bank_file_path, BANK_COLUMNS, 'ACC.ACCOUNT NAME', 'FIN.POSTING DATE',
+                spill_dir, partition, preserve_original, chunk_rows, buckets, bank_key
+            )
+            certify_key = name_resolver.certify_resolver(bank_names) if resolve_names else get_last_name
+            certify_paths, certify_columns, certify_rows = spill_partitions(
+                certify_file_path, CERTIFY_COLUMNS, 'Employee', 'Processed Date',
+                spill_dir, partition, preserve_original, chunk_rows, buckets, certify_key
+            )
+            record['rows_out'] = bank_rows + certify_rows
+        if resolve_names:
+            name_resolver.save()
+            name_resolver = _PresolvedNames(name_resolver)
+        
+        residue_bank = pd.DataFrame(columns=bank_columns)
+        residue_certify = pd.DataFrame(columns=certify_columns)
+        keys = sorted(set(bank_paths) | set(certify_paths))
+        try:
+            for number, key in enumerate(keys, start=1):
+                monitor.report('load', f"Partition {key} ({number}/{len(keys)})")
+                print(f"\n=== Partition {key} ({number}/{len(keys)}) ===")
+                bank_df = _with_residue(residue_bank, read_spilled_partition(bank_paths.get(key), bank_columns))
+                certify_df = _with_residue(residue_certify,
+                                           read_spilled_partition(certify_paths.get(key), certify_columns))
+                
+                matches, unmatched_bank, unmatched_certify = reconcile_frames(bank_df, certify_df, workers, monitor,
+                                                                              date_window_days, name_resolver,
+                                                                              engine, time_budget)
+                if not matches.empty:
+                    matches_df = matches.sort_values(['Last Name', 'Group Total', 'Amount'])
+                    writers['matches'].append(matches_df)
+                
+                # Carry recent unmatched rows into the next window; everything older is final
+                if partition == 'month' and key != UNDATED_PARTITION and number < len(keys):
+                    current = int(key[:4]) * 12 + int(key[5:7]) - 1
+                    keep_bank = _month_number(unmatched_bank['FIN.POSTING DATE']) > current - carry_months
+                    keep_certify = _month_number(unmatched_certify['Processed Date']) > current - carry_months
+                else:
+                    keep_bank = pd.Series(False, index=unmatched_bank.index)
+                    keep_certify = pd.Series(False, index=unmatched_certify.index)
+                writers['bank'].append(unmatched_bank[~keep_bank])
+                writers['certify'].append(unmatched_certify[~keep_certify])
+                residue_bank = unmatched_bank[keep_bank]
+                residue_certify = unmatched_certify[keep_certify]
+        finally:
+            for writer in writers.values():
+                writer.close()
+    
+    summary = {
+        'partitions': len(keys),
+        'matched': writers['matches'].rows,
+        'unmatched_bank': writers['bank'].rows,
+        'unmatched_certify': writers['certify'].rows
+    }
+    print("\nStreaming Reconciliation Summary:")
+    print(f"Partitions: {summary['partitions']}")
+    print(f"Matched Transactions: {summary['matched']}")
+    print(f"Unmatched Bank Transactions: {summary['unmatched_bank']}")
+    print(f"Unmatched Certify Transactions: {summary['unmatched_certify']}")
+    print("\nFiles saved in:", output_dir)
+    return summary
+
+def compare_engines(bank_file_path, certify_file_path, engines=MATCH_ENGINES, **options):
+    """Run each matching engine on the same inputs and report match rate and run time side by side.
+
+    The match rate is the share of rows left after prefiltering that end up matched or
+    cancelled out. Returns {engine: (matches, unmatched_bank, unmatched_certify)}.
+    """
+    results = {}
+    report = []
+    for engine in engines:
+        monitor = PipelineMonitor()
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            results[engine] = reconcile_statements(bank_file_path, certify_file_path, monitor=monitor,
+                                                   engine=engine, **options)
+        elapsed = time.perf_counter() - start
+        matches, unmatched_bank, unmatched_certify = results[engine]
+        rows = next(record['rows_out'] for record in monitor.profile.stages if record['stage'] == 'prefilter')
+        rate = 1 - (len(unmatched_bank) + len(unmatched_certify)) / rows if rows else 0.0
+        report.append((engine, len(matches), len(unmatched_bank), len(unmatched_certify), rate, elapsed))
+    
+    print(f"\n{'Engine':<10} {'Matched':>8} {'Unmatched bank':>15} {'Unmatched certify':>18} "
+          f"{'Match rate':>11} {'Time':>9}")
+    for engine, matched, unmatched_bank, unmatched_certify, rate, elapsed in report:
+        print(f"{engine:<10} {matched:>8} {unmatched_bank:>15} {unmatched_certify:>18} "
+              f"{rate:>10.1%} {elapsed:>8.2f}s")
+    return results
+
+# Batch mode: many bank/Certify pairs in one invocation, one output directory per pair
+BATCH_SUMMARY_COLUMNS = ['name', 'bank_file', 'certify_file', 'output_dir', 'status', 'matched',
+                         'unmatched_bank', 'unmatched_certify', 'seconds', 'error']
+
+def read_batch_manifest(path):
+    """Jobs from a CSV manifest with name, bank and certify columns (paths relative to the manifest)"""
+    manifest = pd.read_csv(path)
+    missing = {'name', 'bank', 'certify'} - set(manifest.columns)
+    if missing:
+        raise ValueError(f"Batch manifest {path} is missing columns: {', '.join(sorted(missing))}")
+    base_dir = os.path.dirname(os.path.abspath(path))
+    return [(str(row['name']), os.path.join(base_dir, row['bank']), os.path.join(base_dir, row['certify']))
+            for _, row in manifest.iterrows()]
+
+def _certify_counterpart(bank_file):
+    """The Certify file paired with a bank file: bank_statement -> certify_report, or bank -> certify"""
+    directory, filename = os.path.split(bank_file)
+    for bank_token, certify_token in (('bank_statement', 'certify_report'), ('bank', 'certify')):
+        match = None
+        for match in re.finditer(bank_token, filename, flags=re.IGNORECASE):
+            pass
+        if match:
+            stem = os.path.splitext(filename)[0]
+            name = stem[:match.start()] + stem[match.end():]
+            certify_file = os.path.join(directory, filename[:match.start()] + certify_token + filename[match.end():])
+            return re.sub(r'^[\s_.-]+|[\s_.-]+$', '', name) or 'default', certify_file
+    return os.path.splitext(filename)[0], None
+
+def discover_batch_pairs(pattern):
+    """Jobs from a directory or glob of bank files, each paired with the Certify file named like it"""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '*bank*.xlsx')
+    jobs = []
+    for bank_file in sorted(glob.glob(pattern)):
+        name, certify_file = _certify_counterpart(bank_file)
+        jobs.append((name, bank_file, certify_file))
+    if not jobs:
+        raise FileNotFoundError(f"No bank statements match {pattern}")
+    return jobs
+
+def reconcile_pair(job):
+    """Batch worker: reconcile one pair into its own output directory and return its summary row.
+
+    Console output goes to reconciliation.log in the pair's output directory.
+    """
+    name, bank_file, certify_file, output_dir, options = job
+    row = {'name': name, 'bank_file': bank_file, 'certify_file': certify_file, 'output_dir': output_dir,
+           'status': 'ok', 'error': ''}
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, 'reconciliation.log'), 'w') as log, redirect_stdout(log):
+        try:
+            if certify_file is None or not os.path.exists(certify_file):
+                raise FileNotFoundError(f"No Certify report for {bank_file}")
+            name_resolver = NameResolver() if options.get('resolve_names') else None
+            matches, unmatched_bank, unmatched_certify = reconcile_statements(
+                bank_file, certify_file, preserve_original=options.get('preserve_original', True),
+                use_cache=options.get('use_cache', True), date_window_days=options.get('date_window_days'),
+                name_resolver=name_resolver, engine=options.get('engine', 'greedy'),
+                time_budget=options.get('time_budget', OPTIMAL_TIME_BUDGET)
+            )
+            save_results(matches, unmatched_bank, unmatched_certify, output_dir,
+                         options.get('output_format', 'xlsx'), options.get('store'))
+            row.update(matched=len(matches), unmatched_bank=len(unmatched_bank),
+                       unmatched_certify=len(unmatched_certify))
+        except Exception as e:
+            print(f"\nError: {e}")
+            row.update(status='error', error=str(e))
+    row['seconds'] = round(time.perf_counter() - start, 3)
+    return row
+
+def run_batch(jobs, output_root="reconciliation_output", workers=None, **options):
+    """Reconcile every (name, bank file, certify file) job on a process pool.
+
+    Each pair writes to output_root/<name>; the parsed-input cache, the name mapping and
+    the store given as store=PATH, if any, are shared on disk. Writes and returns the
+    consolidated batch_summary.csv table.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = [(name, bank_file, certify_file, os.path.join(output_root, name), options)
+             for name, bank_file, certify_file in jobs]
+    if not tasks:
+        raise ValueError("No bank/Certify pairs to reconcile")
+    # Pairs sharing a name would write into the same output directory at once
+    names_by_dir = {}
+    for name, _, _, output_dir, _ in tasks:
+        names_by_dir.setdefault(os.path.normcase(output_dir), []).append(name)
+    repeated = sorted({name for names in names_by_dir.values() if len(names) > 1 for name in names})
+    if repeated:
+        raise ValueError(f"Batch pair names must be unique, repeated: {', '.join(repeated)}")
+    rows = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        futures = [executor.submit(reconcile_pair, task) for task in tasks]
+        for future in as_completed(futures):
+            row = future.result()
+            rows.append(row)
+            outcome = (f"{row['matched']} matched, {row['unmatched_bank']} unmatched bank, "
+                       f"{row['unmatched_certify']} unmatched certify" if row['status'] == 'ok' else row['error'])
+            print(f"[{len(rows)}/{len(tasks)}] {row['name']}: {outcome} ({row['seconds']:.1f}s)")
+    
+    summary = pd.DataFrame(rows, columns=BATCH_SUMMARY_COLUMNS).sort_values('name')
+    counts = ['matched', 'unmatched_bank', 'unmatched_certify']
+    summary[counts] = summary[counts].astype('Int64')
+    os.makedirs(output_root, exist_ok=True)
+    summary_path = os.path.join(output_root, 'batch_summary.csv')
+    summary.to_csv(summary_path, index=False)
+    failed = (summary['status'] != 'ok').sum()
+    print(f"\nBatch finished: {len(summary) - failed} of {len(summary)} pairs reconciled "
+          f"in {time.perf_counter() - start:.1f}s")
+    print("Summary saved to", summary_path)
+    return summary
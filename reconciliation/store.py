@@ -0,0 +1,286 @@
+"""SQLite history of reconciliation runs, with indexed lookups by last name, amount and posting date.
+
+Query it with: python -m reconciliation.store STORE [--last-name NAME] [--amount AMOUNT] ...
+"""
+import os
+import sys
+import json
+import sqlite3
+import argparse
+from datetime import datetime
+
+import pandas as pd
+
+from .core import DERIVED_COLUMNS, get_last_name, to_cents_array
+
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    output_dir TEXT,
+    output_format TEXT,
+    matched INTEGER NOT NULL,
+    unmatched_bank INTEGER NOT NULL,
+    unmatched_certify INTEGER NOT NULL,
+    bank_columns TEXT NOT NULL,
+    certify_columns TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS matched (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    group_id INTEGER NOT NULL,
+    last_name TEXT NOT NULL,
+    amount_cents INTEGER,
+    group_total_cents INTEGER,
+    bank_date TEXT,
+    certify_date TEXT,
+    bank_description TEXT,
+    certify_description TEXT,
+    expense_category TEXT
+);
+CREATE TABLE IF NOT EXISTS unmatched (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    source TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    amount_cents INTEGER,
+    posting_date TEXT,
+    description TEXT,
+    row_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS matched_run ON matched(run_id, group_id);
+CREATE INDEX IF NOT EXISTS matched_last_name ON matched(last_name);
+CREATE INDEX IF NOT EXISTS matched_amount ON matched(amount_cents);
+CREATE INDEX IF NOT EXISTS matched_group_total ON matched(group_total_cents);
+CREATE INDEX IF NOT EXISTS matched_bank_date ON matched(bank_date);
+CREATE INDEX IF NOT EXISTS unmatched_run ON unmatched(run_id, source);
+CREATE INDEX IF NOT EXISTS unmatched_last_name ON unmatched(last_name);
+CREATE INDEX IF NOT EXISTS unmatched_amount ON unmatched(amount_cents);
+CREATE INDEX IF NOT EXISTS unmatched_posting_date ON unmatched(posting_date);
+"""
+
+# Per side of the unmatched output: cardholder name, amount, posting date and description columns
+UNMATCHED_SOURCES = {
+    'bank': ('ACC.ACCOUNT NAME', 'FIN.TRANSACTION AMOUNT', 'FIN.POSTING DATE', 'FIN.TRANSACTION DESCRIPTION'),
+    'certify': ('Employee', 'USD Amt', 'Processed Date', 'Vendor')
+}
+
+def _iso_dates(values):
+    """YYYY-MM-DD strings, None where the date is missing or unparseable"""
+    dates = pd.to_datetime(pd.Series(values), errors='coerce')
+    return dates.dt.strftime('%Y-%m-%d').astype(object).where(dates.notna(), None).tolist()
+
+def _text(values):
+    values = pd.Series(values)
+    return values.astype(object).where(values.notna(), None).tolist()
+
+def _match_groups(matches_df):
+    """Group number of each match row: the group_id index build_match_table sets.
+
+    For match records without it, a group starts wherever the cardholder or the group
+    total changes; two adjacent groups of one cardholder with the same total share a number.
+    """
+    if matches_df.index.name == 'group_id':
+        return matches_df.index.tolist()
+    key = matches_df[['Last Name', 'Group Total']]
+    starts = (key != key.shift()).any(axis=1)
+    return starts.cumsum().tolist()
+
+class ReconciliationStore:
+    """Runs, matched pairs and unmatched transactions of every saved reconciliation in one SQLite file.
+
+    Amounts are stored in integer cents and dates as YYYY-MM-DD text, both indexed, so
+    "was this charge ever matched?" is an index lookup rather than a scan of old workbooks.
+    Unmatched rows also keep all their original columns, for carrying them into a later run.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Batch workers may write to one store concurrently; wait for the lock instead of failing
+        self.connection = sqlite3.connect(path, timeout=60)
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            self.connection.close()
+            raise ValueError(f"Store {path} has schema version {version}, expected {SCHEMA_VERSION}")
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add_run(self, matches_df, unmatched_bank_df, unmatched_certify_df, output_dir=None, output_format=None):
+        """Record one reconciliation; returns its run_id"""
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (created_at, output_dir, output_format, matched, unmatched_bank, "
+                "unmatched_certify, bank_columns, certify_columns) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (datetime.now().isoformat(timespec='seconds'), output_dir, output_format, len(matches_df),
+                 len(unmatched_bank_df), len(unmatched_certify_df),
+                 json.dumps(self._original_columns(unmatched_bank_df)),
+                 json.dumps(self._original_columns(unmatched_certify_df)))
+            )
+            run_id = cursor.lastrowid
+            if not matches_df.empty:
+                self.connection.executemany(
+                    "INSERT INTO matched VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    zip([run_id] * len(matches_df), _match_groups(matches_df),
+                        matches_df['Last Name'].astype(str).str.upper().tolist(),
+                        to_cents_array(matches_df['Amount']).tolist(),
+                        to_cents_array(matches_df['Group Total']).tolist(),
+                        _iso_dates(matches_df['Bank Date']), _iso_dates(matches_df['Certify Date']),
+                        _text(matches_df['Bank Description']), _text(matches_df['Certify Description']),
+                        _text(matches_df['Expense Category']))
+                )
+            for source, df in (('bank', unmatched_bank_df), ('certify', unmatched_certify_df)):
+                self._add_unmatched(run_id, source, df)
+        return run_id
+
+    @staticmethod
+    def _original_columns(df):
+        return [str(col) for col in df.columns if col not in DERIVED_COLUMNS]
+
+    def _add_unmatched(self, run_id, source, df):
+        if df.empty:
+            return
+        name_col, amount_col, date_col, desc_col = UNMATCHED_SOURCES[source]
+        if 'LAST_NAME' in df.columns:
+            last_names = df['LAST_NAME'].astype(str).str.upper().tolist()
+        else:
+            last_names = [get_last_name(name) for name in df[name_col].tolist()]
+        original = df[[col for col in df.columns if col not in DERIVED_COLUMNS]]
+        rows = original.to_json(orient='records', lines=True, date_format='iso').splitlines()
+        self.connection.executemany(
+            "INSERT INTO unmatched VALUES (?, ?, ?, ?, ?, ?, ?)",
+            zip([run_id] * len(df), [source] * len(df), last_names, to_cents_array(df[amount_col]).tolist(),
+                _iso_dates(df[date_col]), _text(df[desc_col]), rows)
+        )
+
+    def runs(self):
+        return pd.read_sql_query("SELECT * FROM runs ORDER BY run_id", self.connection)
+
+    def latest_run(self):
+        return self.connection.execute("SELECT max(run_id) FROM runs").fetchone()[0]
+
+    def find(self, last_name=None, amount=None, date_from=None, date_to=None, status='all', run_id=None):
+        """Matched and/or unmatched rows matching every given filter, newest run first.
+
+        last_name also matches resolved cardholder keys ("SMITH" finds "SMITH J"); amount
+        finds matched rows by their own amount or their group total; dates are inclusive
+        and compare the bank posting date of matched rows.
+        """
+        if status not in ('all', 'matched', 'unmatched'):
+            raise ValueError(f"Unknown status '{status}', expected all, matched or unmatched")
+        results = []
+        if status in ('all', 'matched'):
+            sql, params = self._filters("""
+                SELECT 'matched' AS status, run_id, group_id, NULL AS source, last_name, amount_cents,
+                       group_total_cents, bank_date AS posting_date, certify_date, bank_description AS description,
+                       certify_description, expense_category
+                FROM matched""", last_name, amount, date_from, date_to, run_id,
+                amount_columns=('amount_cents', 'group_total_cents'), date_column='bank_date')
+            results.append(pd.read_sql_query(sql, self.connection, params=params))
+        if status in ('all', 'unmatched'):
+            sql, params = self._filters("""
+                SELECT 'unmatched' AS status, run_id, NULL AS group_id, source, last_name, amount_cents,
+                       NULL AS group_total_cents, posting_date, NULL AS certify_date, description,
+                       NULL AS certify_description, NULL AS expense_category
+                FROM unmatched""", last_name, amount, date_from, date_to, run_id,
+                amount_columns=('amount_cents',), date_column='posting_date')
+            results.append(pd.read_sql_query(sql, self.connection, params=params))
+        found = pd.concat([df for df in results if not df.empty] or results[:1], ignore_index=True)
+        return found.sort_values(['run_id', 'status', 'last_name'], ascending=[False, True, True],
+                                 ignore_index=True)
+
+    @staticmethod
+    def _filters(select, last_name, amount, date_from, date_to, run_id, amount_columns, date_column):
+        conditions = []
+        params = []
+        if last_name:
+            last_name = last_name.strip().upper()
+            conditions.append("(last_name = ? OR last_name GLOB ?)")
+            params += [last_name, f"{last_name} *"]
+        if amount is not None:
+            cents = int(round(abs(amount) * 100))
+            conditions.append("(" + " OR ".join(f"{col} IN (?, ?)" for col in amount_columns) + ")")
+            params += [cents, -cents] * len(amount_columns)
+        if date_from:
+            conditions.append(f"{date_column} >= ?")
+            params.append(pd.Timestamp(date_from).strftime('%Y-%m-%d'))
+        if date_to:
+            conditions.append(f"{date_column} <= ?")
+            params.append(pd.Timestamp(date_to).strftime('%Y-%m-%d'))
+        if run_id is not None:
+            conditions.append("run_id = ?")
+            params.append(run_id)
+        if conditions:
+            select += " WHERE " + " AND ".join(conditions)
+        return select, params
+
+    def unmatched(self, source, run_id=None):
+        """A run's unmatched bank or certify rows with their original columns (default: the latest run)"""
+        run_id = run_id if run_id is not None else self.latest_run()
+        if run_id is None:
+            raise FileNotFoundError(f"No runs recorded in {self.path}")
+        columns = self.connection.execute(f"SELECT {source}_columns FROM runs WHERE run_id = ?",
+                                          (run_id,)).fetchone()
+        if columns is None:
+            raise KeyError(f"No run {run_id} in {self.path}")
+        rows = self.connection.execute(
+            "SELECT row_json FROM unmatched WHERE run_id = ? AND source = ? ORDER BY rowid", (run_id, source)
+        ).fetchall()
+        df = pd.DataFrame([json.loads(row) for row, in rows], columns=json.loads(columns[0]))
+        # JSON keeps dates as ISO strings; read them back as dates, like an xlsx output
+        date_col = UNMATCHED_SOURCES[source][2]
+        if date_col in df.columns:
+            df[date_col] = pd.to_datetime(df[date_col], errors='coerce', format='ISO8601')
+        return df
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m reconciliation.store",
+        description="Look up transactions in a reconciliation store written with start.py --store."
+    )
+    parser.add_argument('store', help="SQLite store file")
+    parser.add_argument('--runs', action='store_true', help="List the recorded runs instead of transactions")
+    parser.add_argument('--last-name', help="Cardholder last name (case-insensitive)")
+    parser.add_argument('--amount', type=float,
+                        help="Transaction amount; matched rows are also found by their group total")
+    parser.add_argument('--from', dest='date_from', metavar='DATE', help="Earliest posting date (YYYY-MM-DD)")
+    parser.add_argument('--to', dest='date_to', metavar='DATE', help="Latest posting date (YYYY-MM-DD)")
+    parser.add_argument('--status', choices=('all', 'matched', 'unmatched'), default='all')
+    parser.add_argument('--run', type=int, dest='run_id', help="Only this run")
+    parser.add_argument('--csv', metavar='PATH', help="Write the results to a CSV file instead of printing them")
+    return parser
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    if not os.path.exists(args.store):
+        print(f"Error: File not found - {args.store}")
+        return 1
+    with ReconciliationStore(args.store) as store:
+        if args.runs:
+            results = store.runs()
+        else:
+            results = store.find(args.last_name, args.amount, args.date_from, args.date_to, args.status,
+                                 args.run_id)
+            for col in ('amount_cents', 'group_total_cents'):
+                results[col.replace('_cents', '')] = results.pop(col) / 100
+    if args.csv:
+        results.to_csv(args.csv, index=False)
+        print(f"Saved {len(results)} rows to {args.csv}")
+    elif results.empty:
+        print("No matching transactions.")
+    else:
+        with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', 200):
+            print(results.to_string(index=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Tests import the reconciliation package from the program directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIRST_NAMES = ['JOHN', 'MARY', 'ANN', 'BOB', 'LI', 'SAM']
+LAST_NAMES = ['SMITH', 'JONES', 'BROWN', 'LEE', 'GARCIA', 'MILLER', 'DAVIS', 'WILSON']
+
+def _split(rng, cents, parts):
+    cuts = np.sort(rng.choice(np.arange(1, cents), parts - 1, replace=False))
+    return np.diff(np.concatenate(([0], cuts, [cents]))).tolist()
+
+@pytest.fixture
+def statements():
+    """Factory of synthetic (bank_df, certify_df) statements in the input column layout.
+
+    Most charges appear once on each side; some are split into 2-3 lines on one side,
+    refunded on the bank side, or missing from the Certify report.
+    """
+    def make(seed=0, people=6, charges=20, start='2024-03-01', days=28):
+        rng = np.random.default_rng(seed)
+        bank, certify = [], []
+        for person in range(people):
+            first, last = FIRST_NAMES[person % len(FIRST_NAMES)], LAST_NAMES[person % len(LAST_NAMES)]
+            for number in range(charges):
+                cents = int(rng.integers(500, 40000))
+                date = pd.Timestamp(start) + pd.Timedelta(days=int(rng.integers(0, days)))
+                certify_date = date + pd.Timedelta(days=int(rng.integers(0, 3)))
+                kind = rng.random()
+                bank_cents, certify_cents = [cents], [cents]
+                if kind < 0.15:
+                    certify_cents = _split(rng, cents, int(rng.integers(2, 4)))
+                elif kind < 0.3:
+                    bank_cents = _split(rng, cents, int(rng.integers(2, 4)))
+                elif kind < 0.4:
+                    bank_cents, certify_cents = [cents, -cents], []
+                elif kind < 0.45:
+                    certify_cents = []
+                bank += [[f"{first} {last}", c / 100, date, f"V{number}"] for c in bank_cents]
+                certify += [[f"{last.title()}, {first.title()}", c / 100, certify_date, f"V{number}", 'Travel']
+                            for c in certify_cents]
+        bank_df = pd.DataFrame([bank[i] for i in rng.permutation(len(bank))],
+                               columns=['ACC.ACCOUNT NAME', 'FIN.TRANSACTION AMOUNT', 'FIN.POSTING DATE',
+                                        'FIN.TRANSACTION DESCRIPTION'])
+        certify_df = pd.DataFrame([certify[i] for i in rng.permutation(len(certify))],
+                                  columns=['Employee', 'USD Amt', 'Processed Date', 'Vendor', 'Expense Category'])
+        return bank_df, certify_df
+    return make
@@ -0,0 +1,54 @@
+"""Batch mode"""
+import os
+import stat
+
+import pandas as pd
+import pytest
+
+from reconciliation.core import NameResolver
+from reconciliation.files import InputCache
+from reconciliation.pipeline import discover_batch_pairs, run_batch
+
+def test_empty_batch_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="No bank/Certify pairs"):
+        run_batch([], str(tmp_path))
+
+def test_cache_put_leaves_no_temporary_files(tmp_path):
+    cache = InputCache(str(tmp_path))
+    df = pd.DataFrame({'a': [1.5, 2.5]})
+    cache.put('key', df)
+    cache.put('key', df)
+    
+    assert [name for name in tmp_path.iterdir() if name.suffix == '.tmp'] == []
+    assert cache.get('key')['a'].tolist() == [1.5, 2.5]
+
+def test_repeated_pair_names_are_rejected(tmp_path):
+    # bank.xlsx and bank_statement.xlsx both pair up under the name 'default'
+    for filename in ('bank.xlsx', 'bank_statement.xlsx'):
+        (tmp_path / filename).write_bytes(b'')
+    jobs = discover_batch_pairs(str(tmp_path))
+    assert [name for name, _, _ in jobs] == ['default', 'default']
+    
+    with pytest.raises(ValueError, match="repeated: default"):
+        run_batch(jobs, str(tmp_path / 'out'))
+    assert not (tmp_path / 'out').exists()
+
+def test_shared_files_follow_the_umask(tmp_path):
+    old_umask = os.umask(0o022)
+    try:
+        InputCache(str(tmp_path)).put('key', pd.DataFrame({'a': [1.5]}))
+        resolver = NameResolver(str(tmp_path / 'name_map.json'))
+        resolver.resolve(pd.Series(['JOHN SMITH']), pd.Series(['Smith, John']))
+    finally:
+        os.umask(old_umask)
+    
+    written = [path for path in tmp_path.iterdir() if path.suffix in ('.parquet', '.pkl', '.json')]
+    assert len(written) == 2
+    assert {stat.S_IMODE(path.stat().st_mode) for path in written} == {0o644}
+
+def test_replaced_file_keeps_its_mode(tmp_path):
+    path = tmp_path / 'name_map.json'
+    path.write_text('{}')
+    path.chmod(0o664)
+    NameResolver(str(path)).save()
+    assert stat.S_IMODE(path.stat().st_mode) == 0o664
@@ -0,0 +1,41 @@
+"""Command line argument checks, defaults and exit statuses"""
+import importlib.util
+import inspect
+
+import pytest
+
+from reconciliation import cli, constants
+
+def test_parquet_rejected_without_engine(monkeypatch, capsys):
+    monkeypatch.setattr(importlib.util, 'find_spec', lambda name: None)
+    assert 'parquet' not in constants.available_output_formats()
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(['--format', 'parquet'])
+    assert exit_info.value.code == 2
+    assert 'pyarrow' in capsys.readouterr().err
+
+def test_missing_inputs_exit_non_zero(monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(cli, 'PROGRAM_DIR', str(tmp_path))
+    assert cli.main(['--no-cache', '--output-dir', str(tmp_path / 'out')]) == 1
+    assert 'File not found' in capsys.readouterr().out
+
+def test_batch_with_failed_pair_exits_non_zero(tmp_path, capsys):
+    # A bank statement without its Certify report fails that pair
+    (tmp_path / 'east_bank_statement.xlsx').write_bytes(b'')
+    assert cli.main(['--batch', str(tmp_path), '--no-cache', '--output-dir', str(tmp_path / 'out')]) == 1
+    assert '0 of 1 pairs reconciled' in capsys.readouterr().out
+
+def test_profile_rejected_with_batch(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(['--batch', 'pairs.csv', '--profile'])
+    assert exit_info.value.code == 2
+    assert '--profile' in capsys.readouterr().err
+
+def test_optimal_engine_defaults_share_one_time_budget():
+    from reconciliation.core import optimal_match_cardholder
+    from reconciliation.pipeline import reconcile_statements
+    
+    budgets = {cli.build_arg_parser().get_default('time_budget'),
+               inspect.signature(optimal_match_cardholder).parameters['time_budget'].default,
+               inspect.signature(reconcile_statements).parameters['time_budget'].default}
+    assert budgets == {constants.OPTIMAL_TIME_BUDGET}
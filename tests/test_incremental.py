@@ -0,0 +1,71 @@
+"""Row fingerprints must survive a round trip through the output files"""
+import pandas as pd
+import pytest
+
+from reconciliation.files import BANK_COLUMNS, CERTIFY_COLUMNS, OUTPUT_WRITERS, save_results
+from reconciliation.pipeline import (load_previous_unmatched, reconcile_incremental, reconcile_statements,
+                                     row_fingerprints)
+
+def bank_rows():
+    return pd.DataFrame({
+        'ACC.ACCOUNT NAME': ['MARY SMITH', 'MARY SMITH', 'JOHN LEE', None],
+        'FIN.TRANSACTION AMOUNT': [12.3, 12.3, 0.1 + 0.2, -45.0],
+        'FIN.POSTING DATE': pd.to_datetime(['2024-03-01', '2024-03-01', '2024-03-05', None]),
+        'FIN.TRANSACTION DESCRIPTION': ['TAXI', 'TAXI', 'HOTEL ', 'REFUND'],
+        'EXTRA': [1, 2, 3, 4]
+    })
+
+@pytest.mark.parametrize('output_format', ['xlsx', 'csv'])
+def test_fingerprints_stable_after_round_trip(tmp_path, output_format):
+    df = bank_rows()
+    # Outputs carry the derived columns too; reading back drops them
+    written = df.assign(LAST_NAME=['SMITH', 'SMITH', 'LEE', ''], AMOUNT=df['FIN.TRANSACTION AMOUNT'])
+    OUTPUT_WRITERS[output_format](written, str(tmp_path / f"unmatched_bank.{output_format}"))
+    
+    read_back = load_previous_unmatched(str(tmp_path), 'bank')
+    
+    assert list(read_back.columns) == list(df.columns)
+    original = row_fingerprints(df, BANK_COLUMNS, 'FIN.TRANSACTION AMOUNT', 'FIN.POSTING DATE')
+    assert row_fingerprints(read_back, BANK_COLUMNS, 'FIN.TRANSACTION AMOUNT',
+                            'FIN.POSTING DATE').tolist() == original.tolist()
+
+def test_repeated_rows_get_distinct_fingerprints():
+    fingerprints = row_fingerprints(bank_rows(), BANK_COLUMNS, 'FIN.TRANSACTION AMOUNT', 'FIN.POSTING DATE')
+    assert fingerprints.is_unique
+    assert fingerprints[0].split('-')[0] == fingerprints[1].split('-')[0]
+
+def write_statements(directory, bank_rows, certify_rows):
+    bank_path, certify_path = directory / 'bank.xlsx', directory / 'certify.xlsx'
+    pd.DataFrame(bank_rows, columns=BANK_COLUMNS).to_excel(bank_path, index=False)
+    pd.DataFrame(certify_rows, columns=CERTIFY_COLUMNS).to_excel(certify_path, index=False)
+    return str(bank_path), str(certify_path)
+
+def test_residue_carried_from_csv_output_keeps_date_types(tmp_path):
+    march, april = tmp_path / 'march', tmp_path / 'april'
+    march.mkdir()
+    april.mkdir()
+    bank_path, certify_path = write_statements(
+        march,
+        [['JOHN SMITH', 10.0, pd.Timestamp('2024-03-28'), 'TAXI'],
+         ['JOHN SMITH', 20.0, pd.Timestamp('2024-03-05'), 'HOTEL']],
+        [['Smith, John', 20.0, pd.Timestamp('2024-03-05'), 'HOTEL', 'Travel'],
+         ['Smith, John', 45.0, pd.Timestamp('2024-03-30'), 'MEAL', 'Meals']]
+    )
+    save_results(*reconcile_statements(bank_path, certify_path, use_cache=False), str(tmp_path / 'out'), 'csv')
+    bank_path, certify_path = write_statements(
+        april,
+        [['JOHN SMITH', 45.0, pd.Timestamp('2024-04-02'), 'MEAL'],
+         ['JOHN SMITH', 30.0, pd.Timestamp('2024-04-03'), 'TAXI']],
+        [['Smith, John', 10.0, pd.Timestamp('2024-04-01'), 'TAXI', 'Travel']]
+    )
+    
+    residue = load_previous_unmatched(str(tmp_path / 'out'), 'bank')
+    matches, unmatched_bank, unmatched_certify = reconcile_incremental(
+        bank_path, certify_path, previous_output_dir=str(tmp_path / 'out'), use_cache=False)
+    
+    assert pd.api.types.is_datetime64_any_dtype(residue['FIN.POSTING DATE'])
+    assert sorted(matches['Amount']) == [10.0, 45.0]
+    assert all(isinstance(date, pd.Timestamp) for date in matches['Bank Date'])
+    assert all(isinstance(date, pd.Timestamp) for date in matches['Certify Date'])
+    assert unmatched_bank['FIN.POSTING DATE'].tolist() == [pd.Timestamp('2024-04-03')]
+    assert unmatched_certify.empty
@@ -0,0 +1,35 @@
+"""Loading only the pipeline columns must give the same explicitly typed columns as a full load"""
+import pandas as pd
+import pytest
+
+from reconciliation.files import BANK_COLUMNS, apply_column_types, load_bank_statement
+
+def write_bank_sheet(path):
+    pd.DataFrame({
+        'ACC.ACCOUNT NAME': ['MARY SMITH', 1234, None],
+        'EXTRA': ['a', 'b', 'c'],
+        'FIN.TRANSACTION AMOUNT': ['12.30', 7, 'n/a'],
+        'FIN.POSTING DATE': ['2024-03-01', '2024-03-05', None],
+        'FIN.TRANSACTION DESCRIPTION': ['TAXI', 'HOTEL', 'REFUND']
+    }).to_excel(path, index=False)
+
+@pytest.mark.parametrize('preserve_original', [True, False])
+def test_pipeline_columns_are_typed(tmp_path, preserve_original):
+    path = tmp_path / 'bank.xlsx'
+    write_bank_sheet(path)
+
+    df = load_bank_statement(str(path), preserve_original)
+
+    expected = ['ACC.ACCOUNT NAME', 'EXTRA'] + BANK_COLUMNS[1:] if preserve_original else BANK_COLUMNS
+    assert list(df.columns) == expected
+    assert df['FIN.TRANSACTION AMOUNT'].dtype == 'float64'
+    assert df['FIN.TRANSACTION AMOUNT'].tolist()[:2] == [12.3, 7.0]
+    assert pd.isna(df['FIN.TRANSACTION AMOUNT'].iloc[2])
+    assert pd.api.types.is_datetime64_any_dtype(df['FIN.POSTING DATE'])
+    assert df['ACC.ACCOUNT NAME'].tolist()[:2] == ['MARY SMITH', '1234']
+    assert pd.isna(df['ACC.ACCOUNT NAME'].iloc[2])
+
+def test_unparseable_date_column_is_left_as_read():
+    df = pd.DataFrame({'FIN.POSTING DATE': ['2024-03-01', 'pending']})
+    apply_column_types(df)
+    assert df['FIN.POSTING DATE'].tolist() == ['2024-03-01', 'pending']
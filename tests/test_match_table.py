@@ -0,0 +1,51 @@
+"""The bulk match table against the original per-group loop"""
+import pandas as pd
+
+from reconciliation.core import find_matching_groups
+from reconciliation.pipeline import build_match_table
+
+def reference_match_table(matched_groups, bank_df, certify_df):
+    """The original loop: one record per zipped (bank, certify) row pair of each group not summing to zero"""
+    matches = []
+    matched_bank_indices = set()
+    matched_certify_indices = set()
+    for group in matched_groups:
+        bank_sum = bank_df.loc[group['bank_indices']]['FIN.TRANSACTION AMOUNT'].sum().round(2)
+        if abs(bank_sum) <= 0.01:
+            continue
+        bank_entries = bank_df.loc[group['bank_indices']]
+        certify_entries = certify_df.loc[group['certify_indices']]
+        group_total = abs(bank_entries['FIN.TRANSACTION AMOUNT'].sum().round(2))
+        for bank_row, certify_row in zip(bank_entries.iterrows(), certify_entries.iterrows()):
+            matches.append({
+                'Last Name': group['last_name'],
+                'Amount': certify_row[1]['AMOUNT'],
+                'Bank Date': bank_row[1]['FIN.POSTING DATE'],
+                'Certify Date': certify_row[1]['Processed Date'],
+                'Bank Description': bank_row[1]['FIN.TRANSACTION DESCRIPTION'],
+                'Certify Description': certify_row[1]['Vendor'],
+                'Expense Category': certify_row[1]['Expense Category'],
+                'Group Total': group_total
+            })
+        matched_bank_indices.update(group['bank_indices'])
+        matched_certify_indices.update(group['certify_indices'])
+    return pd.DataFrame(matches), matched_bank_indices, matched_certify_indices
+
+def test_match_table_equals_per_group_loop(statements):
+    bank_df, certify_df = statements(seed=7)
+    groups = find_matching_groups(bank_df, certify_df)
+    # A charge and its refund grouped together sum to zero and must be skipped
+    refund = bank_df.index[bank_df['FIN.TRANSACTION AMOUNT'] < 0][0]
+    charge = bank_df.index[(bank_df['FIN.TRANSACTION AMOUNT'] == -bank_df.loc[refund, 'FIN.TRANSACTION AMOUNT'])
+                           & (bank_df['ACC.ACCOUNT NAME'] == bank_df.loc[refund, 'ACC.ACCOUNT NAME'])][0]
+    groups.append({'last_name': bank_df.loc[refund, 'LAST_NAME'], 'bank_indices': [charge, refund],
+                   'certify_indices': [certify_df.index[0]]})
+    
+    matches, matched_bank, matched_certify = build_match_table(groups, bank_df, certify_df)
+    expected, expected_bank, expected_certify = reference_match_table(groups, bank_df, certify_df)
+    
+    # Groups of unequal sizes pair only up to their shorter side
+    assert any(len(g['bank_indices']) != len(g['certify_indices']) for g in groups)
+    pd.testing.assert_frame_equal(matches.reset_index(drop=True), expected)
+    assert set(matched_bank) == expected_bank
+    assert set(matched_certify) == expected_certify
@@ -0,0 +1,214 @@
+"""Matching results checked against brute-force and reference implementations"""
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from reconciliation.core import (COMBINATION_MEMO, CombinationMemo, TransactionArrays, find_exact_matches,
+                                 find_matching_groups, find_sum_combinations, find_zero_sum_combinations,
+                                 optimal_match_cardholder, to_cents)
+
+@pytest.fixture(autouse=True)
+def clear_memo():
+    COMBINATION_MEMO.clear()
+    yield
+    COMBINATION_MEMO.clear()
+
+def brute_force_sum_combinations(transactions, target_sum, max_combo_size=5):
+    """The original itertools search: every combination of the smallest size that hits the target"""
+    if abs(target_sum) <= 0.001:
+        return []
+    sorted_trans = sorted(transactions, key=lambda x: abs(x['amount']))
+    n = len(sorted_trans)
+    results = []
+    for size in range(1, min(max_combo_size + 1, n + 1)):
+        for combo in combinations(range(n), size):
+            combo_sum = sum(sorted_trans[i]['amount'] for i in combo)
+            if abs(abs(combo_sum) - abs(target_sum)) < 0.001:
+                results.append([sorted_trans[i]['index'] for i in combo])
+        if results:
+            break
+    return results
+
+def random_cents(rng, size, low=-5000, high=20000):
+    cents = rng.integers(low, high, size)
+    cents[cents == 0] = 1
+    return cents
+
+@pytest.mark.parametrize('seed', range(40))
+def test_find_sum_combinations_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    cents = random_cents(rng, int(rng.integers(1, 13)))
+    transactions = [{'amount': c / 100, 'index': 100 + i} for i, c in enumerate(cents.tolist())]
+    picks = rng.choice(len(cents), int(rng.integers(1, min(4, len(cents)) + 1)), replace=False)
+    target = cents[picks].sum() / 100
+    if rng.random() < 0.2:
+        target = rng.integers(1, 50000) / 100  # usually unreachable
+    
+    assert find_sum_combinations(transactions, target) == brute_force_sum_combinations(transactions, target)
+
+def test_find_sum_combinations_repeated_values():
+    transactions = [{'amount': 10.0, 'index': i} for i in range(6)]
+    assert find_sum_combinations(transactions, 30.0) == brute_force_sum_combinations(transactions, 30.0)
+
+def reference_exact_pairs(bank_df, certify_df):
+    """The original first pass: per last name (bank order), per amount (first bank appearance),
+    the first n open rows of each side in row order"""
+    groups = []
+    for last_name in bank_df['LAST_NAME'].unique():
+        bank_group = bank_df[bank_df['LAST_NAME'] == last_name]
+        certify_group = certify_df[certify_df['LAST_NAME'] == last_name]
+        bank_counts = bank_group['CENTS'][bank_group['CENTS'] != 0].value_counts(sort=False)
+        certify_counts = certify_group['CENTS'][certify_group['CENTS'] != 0].value_counts(sort=False)
+        for cents, bank_count in bank_counts.items():
+            if cents not in certify_counts.index:
+                continue
+            n = min(bank_count, certify_counts[cents])
+            groups.append((last_name, cents,
+                           bank_group.index[bank_group['CENTS'] == cents][:n].tolist(),
+                           certify_group.index[certify_group['CENTS'] == cents][:n].tolist()))
+    return groups
+
+@pytest.mark.parametrize('seed', range(10))
+def test_exact_matches_follow_reference_order(seed):
+    rng = np.random.default_rng(seed)
+    names = ['SMITH', 'JONES', 'LEE']
+    amounts = [1250, 990, 4000, 1250, 75, 320]  # few distinct amounts, so most have duplicates
+    bank_df = pd.DataFrame({'LAST_NAME': rng.choice(names, 40), 'CENTS': rng.choice(amounts, 40)},
+                           index=rng.permutation(1000)[:40])
+    certify_df = pd.DataFrame({'LAST_NAME': rng.choice(names, 35), 'CENTS': rng.choice(amounts, 35)},
+                              index=rng.permutation(1000)[:35])
+    
+    codes, shared_names = pd.factorize(bank_df['LAST_NAME'])
+    bank = TransactionArrays(bank_df['CENTS'], bank_df.index, codes, names=shared_names)
+    certify = TransactionArrays(certify_df['CENTS'], certify_df.index,
+                                pd.Categorical(certify_df['LAST_NAME'], categories=shared_names).codes,
+                                names=shared_names)
+    found = [(group['last_name'], to_cents(group['amount']), group['bank_indices'], group['certify_indices'])
+             for code in range(len(shared_names)) for group in find_exact_matches(bank, certify).get(code, [])]
+    
+    assert found == reference_exact_pairs(bank_df, certify_df)
+
+@pytest.mark.parametrize('seed', range(20))
+def test_zero_sum_combinations_are_disjoint_and_sum_to_zero(seed):
+    rng = np.random.default_rng(seed)
+    values = random_cents(rng, 6).tolist()
+    # Plant a charge split into two refunds, and a charge refunded in three parts
+    values += [3000, -1000, -2000, 4500, -1500, -1500, -1500]
+    values = rng.permutation(values)
+    
+    positions, complete = find_zero_sum_combinations(values)
+    
+    assert complete
+    assert len(positions) == len(set(positions)) >= 7
+    assert values[positions].sum() == 0
+    # The members can be partitioned into zero-sum groups of 3 or 4
+    remaining = sorted(positions)
+    while remaining:
+        group = next(combo for size in (3, 4) for combo in combinations(remaining, size)
+                     if values[list(combo)].sum() == 0)
+        remaining = [p for p in remaining if p not in group]
+
+def split_statements(rng, count):
+    """Bank and certify cents where each charge is booked whole on one side and 1-3 lines on the other"""
+    bank, certify = [], []
+    for _ in range(count):
+        total = int(rng.integers(500, 30000))
+        parts = int(rng.integers(1, 4))
+        cuts = np.sort(rng.choice(np.arange(1, total), parts - 1, replace=False)) if parts > 1 else []
+        split = np.diff(np.concatenate(([0], cuts, [total]))).tolist()
+        if rng.random() < 0.5:
+            bank.append(total)
+            certify += split
+        else:
+            bank += split
+            certify.append(total)
+    certify.append(int(rng.integers(100, 900)))  # an unmatched line
+    return rng.permutation(bank), rng.permutation(certify)
+
+@pytest.mark.parametrize('seed', range(8))
+def test_optimal_engine_groups_are_disjoint_and_balanced(seed):
+    rng = np.random.default_rng(seed)
+    bank_cents, certify_cents = split_statements(rng, 8)
+    bank = TransactionArrays(bank_cents, np.arange(len(bank_cents)) + 1000)
+    certify = TransactionArrays(certify_cents, np.arange(len(certify_cents)) + 5000)
+    bank_by_index = dict(zip(bank.index.tolist(), bank.cents.tolist()))
+    certify_by_index = dict(zip(certify.index.tolist(), certify.cents.tolist()))
+    
+    groups = optimal_match_cardholder('SMITH', bank, certify, time_budget=2.0)
+    
+    assert groups
+    bank_used = [i for group in groups for i in group['bank_indices']]
+    certify_used = [i for group in groups for i in group['certify_indices']]
+    assert len(bank_used) == len(set(bank_used))
+    assert len(certify_used) == len(set(certify_used))
+    for group in groups:
+        assert group['last_name'] == 'SMITH'
+        assert (sum(bank_by_index[i] for i in group['bank_indices'])
+                == sum(certify_by_index[i] for i in group['certify_indices']))
+
+def test_zero_sum_search_cut_short_is_not_memoized():
+    values = [3000, -1000, -2000, 4500, -1500, -1500, -1500]
+    
+    assert find_zero_sum_combinations(values, time_budget=-1.0) == ([], False)
+    positions, complete = find_zero_sum_combinations(values, time_budget=2.0)
+    
+    assert complete
+    assert positions == list(range(7))
+
+@pytest.mark.parametrize('engine', ['greedy', 'optimal'])
+def test_parallel_matching_equals_serial(statements, engine):
+    bank_df, certify_df = statements(seed=3)
+    
+    serial = find_matching_groups(bank_df.copy(), certify_df.copy(), workers=1, engine=engine)
+    COMBINATION_MEMO.clear()
+    parallel = find_matching_groups(bank_df.copy(), certify_df.copy(), workers=3, engine=engine)
+    
+    # Split charges reach the combination pass, which is the part run on the pool
+    assert sum(len(group['bank_indices']) + len(group['certify_indices']) > 2 for group in serial) > 10
+    assert parallel == serial
+
+@pytest.mark.parametrize('engine', ['greedy', 'optimal'])
+@pytest.mark.parametrize('second_date, window, matched', [
+    ('2024-03-04', 5, True), ('2024-03-20', 5, False), ('2024-03-20', None, True)
+])
+def test_date_window_limits_split_matches(engine, second_date, window, matched):
+    bank_df = pd.DataFrame({
+        'ACC.ACCOUNT NAME': ['JOHN SMITH'],
+        'FIN.TRANSACTION AMOUNT': [100.0],
+        'FIN.POSTING DATE': pd.to_datetime(['2024-03-01'])
+    })
+    certify_df = pd.DataFrame({
+        'Employee': ['Smith, John'] * 2,
+        'USD Amt': [60.0, 40.0],
+        'Processed Date': pd.to_datetime(['2024-03-01', second_date])
+    })
+    
+    groups = find_matching_groups(bank_df, certify_df, date_window_days=window, engine=engine)
+    
+    assert [(group['bank_indices'], sorted(group['certify_indices'])) for group in groups] == (
+        [([0], [0, 1])] if matched else [])
+
+def test_combination_memo_hits_and_evicts_least_recently_used():
+    memo = CombinationMemo(max_entries=2)
+    computed = []
+    def compute(value):
+        return lambda: computed.append(value) or value
+    
+    assert memo.get_or_compute('a', compute(1)) == 1
+    assert memo.get_or_compute('b', compute(2)) == 2
+    assert memo.get_or_compute('a', compute(99)) == 1  # a hit, and now the most recently used
+    assert memo.get_or_compute('c', compute(3)) == 3  # evicts b
+    assert memo.get_or_compute('b', compute(4)) == 4
+    
+    assert computed == [1, 2, 3, 4]
+    assert memo.counts() == {'hits': 1, 'misses': 4, 'entries': 2}
+
+def test_reordered_zero_sum_search_is_a_memo_hit():
+    values = [3000, -1000, -2000, 700, 4500, -1500, -1500, -1500]
+    positions, complete = find_zero_sum_combinations(values)
+    
+    reordered = values[::-1]
+    assert find_zero_sum_combinations(reordered) == (sorted(len(values) - 1 - p for p in positions), complete)
+    assert COMBINATION_MEMO.counts() == {'hits': 1, 'misses': 1, 'entries': 1}
@@ -0,0 +1,60 @@
+"""Cardholder name resolution"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from reconciliation.core import NameResolver, find_matching_groups, prefilter_bank, prefilter_certify
+
+def test_resolve_categorical_names_with_blanks(tmp_path):
+    resolver = NameResolver(str(tmp_path / 'name_map.json'))
+    bank_names = pd.Series(['MARY JONES', np.nan, 'JOHN SMITH'], dtype='category')
+    certify_names = pd.Series(['Mary Smith-Jones', 'Smith, John', np.nan], dtype='category')
+    
+    bank_keys, certify_keys = resolver.resolve(bank_names, certify_names)
+    
+    assert bank_keys.tolist() == ['JONES M', '', 'SMITH J']
+    assert certify_keys.tolist() == ['JONES M', 'SMITH J', '']
+
+def test_matching_with_resolver_and_blank_names(tmp_path):
+    bank_df = pd.DataFrame({
+        'ACC.ACCOUNT NAME': ['MARY JONES', None, 'JOHN SMITH'],
+        'FIN.TRANSACTION AMOUNT': [25.0, 10.0, 40.0],
+        'FIN.POSTING DATE': pd.to_datetime(['2024-03-01'] * 3),
+        'FIN.TRANSACTION DESCRIPTION': ['TAXI', 'HOTEL', 'AIRLINE']
+    })
+    certify_df = pd.DataFrame({
+        'Employee': ['Mary Smith-Jones', None, 'John Smith'],
+        'USD Amt': [25.0, 10.0, 40.0],
+        'Processed Date': pd.to_datetime(['2024-03-02'] * 3),
+        'Vendor': ['TAXI', 'HOTEL', 'AIRLINE'],
+        'Expense Category': ['Ground', 'Lodging', 'Airfare']
+    })
+    
+    groups = find_matching_groups(prefilter_bank(bank_df), prefilter_certify(certify_df),
+                                  name_resolver=NameResolver(str(tmp_path / 'name_map.json')))
+    
+    # Blank names group together, as they do without a resolver
+    assert sorted((g['last_name'], g['bank_indices'], g['certify_indices']) for g in groups) == [
+        ('', [1], [1]), ('JONES M', [0], [0]), ('SMITH J', [2], [2])
+    ]
+
+def test_concurrent_saves_keep_every_name(tmp_path):
+    path = str(tmp_path / 'name_map.json')
+    
+    def resolve(worker):
+        resolver = NameResolver(path)
+        names = pd.Series([f"PERSON{worker} NAME{worker}"])
+        resolver.resolve(names, names.str.title())
+    
+    threads = [threading.Thread(target=resolve, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    mapping = NameResolver(path).mapping
+    assert sorted(mapping['bank']) == [f"PERSON{worker} NAME{worker}" for worker in range(8)]
+    assert len(mapping['certify']) == 8
+    assert sorted(os.listdir(tmp_path)) == ['name_map.json']
@@ -0,0 +1,16 @@
+"""Output writers"""
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from reconciliation.files import write_excel
+
+def test_excel_writer_matches_to_excel_for_non_finite_amounts(tmp_path):
+    df = pd.DataFrame({'Amount': [1.5, np.inf, -np.inf, np.nan], 'Vendor': ['TAXI', 'HOTEL', None, 'MEAL']})
+    
+    write_excel(df, str(tmp_path / 'streamed.xlsx'))
+    df.to_excel(tmp_path / 'pandas.xlsx', index=False)
+    
+    cells = [row[0] for row in load_workbook(tmp_path / 'streamed.xlsx').active.iter_rows(values_only=True)]
+    assert cells == ['Amount', 1.5, 'inf', '-inf', None]
+    pd.testing.assert_frame_equal(pd.read_excel(tmp_path / 'streamed.xlsx'), pd.read_excel(tmp_path / 'pandas.xlsx'))
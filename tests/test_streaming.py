@@ -0,0 +1,62 @@
+"""Streamed cardholder partitions must match the same rows as a whole-file run"""
+import pandas as pd
+import pytest
+
+from reconciliation.core import NameResolver
+from reconciliation.pipeline import reconcile_statements, reconcile_streaming
+
+def write_inputs(tmp_path):
+    # Bank names are hyphenated or suffixed, so their last names differ from the Certify ones
+    names = [('JOHN ANDERSON-SMITH', 'Smith, John'), ('MARY LEE JR', 'Lee, Mary'), ('SAM CLARK', 'Clark, Sam'),
+             ('ANN BROWN-DAVIS', 'Davis, Ann'), ('EVE MOORE III', 'Moore, Eve'), ('TOM WILSON', 'Wilson, Tom')]
+    bank, certify = [], []
+    for number, (bank_name, certify_name) in enumerate(names):
+        for i in range(3):
+            amount = 10 * number + i + 0.25
+            date = pd.Timestamp('2024-03-01') + pd.Timedelta(days=i)
+            bank.append([bank_name, amount, date, f'V{i}'])
+            certify.append([certify_name, amount, date, f'V{i}', 'Meals'])
+    bank_path, certify_path = tmp_path / 'bank.xlsx', tmp_path / 'certify.xlsx'
+    pd.DataFrame(bank, columns=['ACC.ACCOUNT NAME', 'FIN.TRANSACTION AMOUNT', 'FIN.POSTING DATE',
+                                'FIN.TRANSACTION DESCRIPTION']).to_excel(bank_path, index=False)
+    pd.DataFrame(certify, columns=['Employee', 'USD Amt', 'Processed Date', 'Vendor',
+                                   'Expense Category']).to_excel(certify_path, index=False)
+    return str(bank_path), str(certify_path)
+
+def test_cardholder_partitions_follow_resolved_names(tmp_path):
+    bank_path, certify_path = write_inputs(tmp_path)
+
+    matches, unmatched_bank, unmatched_certify = reconcile_statements(
+        bank_path, certify_path, use_cache=False, name_resolver=NameResolver(str(tmp_path / 'whole.json')))
+    summary = reconcile_streaming(bank_path, certify_path, str(tmp_path / 'out'), partition='cardholder',
+                                  output_format='csv', buckets=4,
+                                  name_resolver=NameResolver(str(tmp_path / 'streamed.json')))
+
+    assert len(matches) == 18
+    assert (summary['matched'], summary['unmatched_bank'], summary['unmatched_certify']) == (
+        len(matches), len(unmatched_bank), len(unmatched_certify))
+
+@pytest.mark.parametrize('carry_months, matched', [(1, 3), (0, 2)])
+def test_month_residue_is_carried_into_the_next_month(tmp_path, carry_months, matched):
+    # The 2024-03-30 charge reaches the Certify report in April
+    bank_path, certify_path = tmp_path / 'bank.xlsx', tmp_path / 'certify.xlsx'
+    pd.DataFrame({
+        'ACC.ACCOUNT NAME': ['JOHN SMITH'] * 3,
+        'FIN.TRANSACTION AMOUNT': [25.5, 100.0, 42.0],
+        'FIN.POSTING DATE': pd.to_datetime(['2024-03-05', '2024-03-30', '2024-04-10']),
+        'FIN.TRANSACTION DESCRIPTION': ['TAXI', 'HOTEL', 'MEAL']
+    }).to_excel(bank_path, index=False)
+    pd.DataFrame({
+        'Employee': ['Smith, John'] * 3,
+        'USD Amt': [25.5, 100.0, 42.0],
+        'Processed Date': pd.to_datetime(['2024-03-06', '2024-04-02', '2024-04-11']),
+        'Vendor': ['TAXI', 'HOTEL', 'MEAL'],
+        'Expense Category': ['Travel'] * 3
+    }).to_excel(certify_path, index=False)
+    
+    summary = reconcile_streaming(str(bank_path), str(certify_path), str(tmp_path / 'out'), partition='month',
+                                  carry_months=carry_months, output_format='csv')
+    
+    assert summary['partitions'] == 2
+    assert (summary['matched'], summary['unmatched_bank'], summary['unmatched_certify']) == (
+        matched, 3 - matched, 3 - matched)